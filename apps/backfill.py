@@ -0,0 +1,28 @@
+import argparse
+import os
+from cfbratings.config import settings
+from cfbratings.ratings import METHODS
+from cfbratings.seasons import run_seasons, seasons_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild ratings, analytics and snapshots for many seasons")
+    parser.add_argument("--start", type=int, default=2000)
+    parser.add_argument("--end", type=int, default=settings.year)
+    parser.add_argument("--season_type", type=str, default=settings.season_type)
+    parser.add_argument("--method", type=str, default="hybrid", choices=METHODS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Parallel season workers")
+    parser.add_argument("--out", type=str, default=seasons_dir())
+    parser.add_argument("--refresh", action="store_true", help="Force refresh cache")
+    args = parser.parse_args()
+
+    years = list(range(args.start, args.end + 1))
+    print(f"Rebuilding {len(years)} seasons ({args.start}–{args.end}, {args.method}) with {args.workers} workers")
+    index = run_seasons(years, method=args.method, season_type=args.season_type,
+                        out_dir=args.out, workers=args.workers, refresh=args.refresh)
+    print(f"\n{len(index['seasons'])} seasons written to {args.out} in {index['elapsed']:.1f}s")
+    if index["errors"]:
+        print(f"{len(index['errors'])} seasons failed: {', '.join(index['errors'])}")
+
+if __name__ == "__main__":
+    main()
@@ -1,61 +1,74 @@
 import argparse
+import os
+from cfbratings import profiling
 from cfbratings.config import settings
-from cfbratings.io import fetch_teams, fetch_games, ensure_snapshots
-from cfbratings.models.colley import build_colley, solve_colley
-from cfbratings.models.massey import build_massey, solve_massey
-from cfbratings.models.elo import run_elo
-from cfbratings.models.hybrid import hybrid_rating
-from cfbratings.analytics import records, strength_of_schedule, momentum, ppoints, compute_conference_strength_robust
+from cfbratings.io import fetch_teams, fetch_games_slim
+from cfbratings.jobs import SnapshotJobs
+from cfbratings.ratings import METHODS
+from cfbratings.results_cache import games_fingerprint, cached_ratings, cached_analytics
+from cfbratings.history import UNRANKED, load_rank_history
+from cfbratings.analytics import compute_conference_strength_robust
 
 
 def main():
     parser = argparse.ArgumentParser(description="CFB Ratings CLI")
     parser.add_argument("--year", type=int, default=settings.year)
     parser.add_argument("--season_type", type=str, default=settings.season_type)
-    parser.add_argument("--method", type=str, default="hybrid", choices=["colley", "massey", "elo", "hybrid"])
+    parser.add_argument("--method", type=str, default="hybrid", choices=METHODS)
     parser.add_argument("--refresh", action="store_true", help="Force refresh cache")
     parser.add_argument("--top", type=int, default=25)
     parser.add_argument("--sort-by", type=str, default="rating",
                         choices=["rating", "sos", "momentum", "ppoints"],
                         help="Column to sort by (default: rating)")
+    parser.add_argument("--recency-decay", type=float, default=settings.recency_decay,
+                        help="Per-week time decay for Colley/Massey (0 = equal weights)")
+    parser.add_argument("--margin-scale", type=float, default=settings.margin_scale,
+                        help="Diminishing-returns margin scale in points for Colley/Massey (default off)")
+    parser.add_argument("--movers", action="store_true", help="Show biggest weekly risers and fallers (hybrid ranks)")
+    parser.add_argument("--trajectory", type=str, default=None, metavar="TEAM",
+                        help="Show a team's weekly rank history (hybrid ranks, whatever --method is)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for building missing weekly snapshots (default: all CPUs)")
+    parser.add_argument("--profile", action="store_true", default=settings.profile,
+                        help="Record stage timings and counters (also CFB_PROFILE=1)")
+    parser.add_argument("--profile-out", type=str, default=os.path.join(settings.cache_dir, "profile_report.json"),
+                        help="Where to write the JSON profile report")
+    parser.add_argument("--cprofile", type=str, default=None, help="Also dump cProfile stats to this path")
     args = parser.parse_args()
 
-    teams = fetch_teams(args.year, force_refresh=args.refresh)
-    conference_map = {t["school"]: t.get("conference") for t in teams}
-    games_payload = fetch_games(args.year, season_type=args.season_type, force_refresh=args.refresh)
-    games = games_payload["data"] if isinstance(games_payload, dict) and "data" in games_payload else games_payload
-    ensure_snapshots(args.year, method=args.method)
+    with profiling.recording(args.profile) as rec:
+        with profiling.cprofile(args.cprofile):
+            run(args)
+        if rec is not None:
+            os.makedirs(os.path.dirname(args.profile_out) or ".", exist_ok=True)
+            rep = profiling.write_report(args.profile_out)
+            print(f"\nProfile ({args.profile_out})")
+            print(profiling.format_report(rep))
+
+def run(args):
+    with profiling.stage("fetch"):
+        teams = fetch_teams(args.year, force_refresh=args.refresh)
+        conference_map = {t["school"]: t.get("conference") for t in teams}
+        games = fetch_games_slim(args.year, season_type=args.season_type, force_refresh=args.refresh)
+    # Missing weekly snapshots build in the background while ratings are computed; they hold
+    # hybrid ratings whatever --method is, and that is what PPoints reads
+    job = SnapshotJobs(workers=args.workers).submit(args.year, method="hybrid")
 
     team_list = [t["school"] for t in teams]
+    profiling.count("games.loaded", len(games))
 
-    if args.method == "colley":
-        C, b = build_colley(team_list, games, prior_strength=settings.colley_prior_strength)
-        r = solve_colley(C, b)
-        ratings = {team_list[i]: float(r[i]) for i in range(len(team_list))}
-    elif args.method == "massey":
-        M, mb = build_massey(team_list, games, ridge_lambda=settings.massey_ridge_lambda, hfa=settings.home_field_adv)
-        r = solve_massey(M, mb)
-        ratings = {team_list[i]: float(r[i]) for i in range(len(team_list))}
-    elif args.method == "elo":
-        ratings = run_elo(team_list, games, init=settings.elo_init, k=settings.elo_k,
-                          regress_to_mean=settings.elo_regress_to_mean, hfa=settings.home_field_adv)
-    else:
-        ratings = hybrid_rating(team_list, games,
-                                colley_weight=0.5, massey_weight=0.5,
-                                prior_strength=settings.colley_prior_strength,
-                                ridge_lambda=settings.massey_ridge_lambda,
-                                hfa=settings.home_field_adv)
-
-    recs = records(team_list, games)
-    sos = strength_of_schedule(team_list, games, ratings)
-    mom = momentum(team_list, games, ratings)
-    pp = ppoints(team_list, games, ratings, conference_map)
+    # Ratings and analytics are served from the results cache when games and parameters are unchanged
+    games_hash = games_fingerprint(games)
+    with profiling.stage("ratings"):
+        ratings = cached_ratings(args.method, team_list, games, games_hash=games_hash,
+                                 recency_decay=args.recency_decay, margin_scale=args.margin_scale)
 
     completed_games = [g for g in games if g.get("completed", False)]
     latest_week = max((g.get("week", 0) for g in completed_games), default=0)
 
     conference_map = {t["school"]: t.get("conference") for t in teams}
-    conf_strength = compute_conference_strength_robust(ratings, conference_map)
+    with profiling.stage("analytics.conference_strength"):
+        conf_strength = compute_conference_strength_robust(ratings, conference_map)
 
     print(f"\nConference Strength ({args.year}, {args.method})")
     print(f"{'Conference':<20} {'Strength':<8}")
@@ -64,6 +77,20 @@ def main():
         print(f"{conf:<20} {val:.2f}")
     print()
 
+    # PPoints reads the weekly snapshots, so wait for them here
+    with profiling.stage("snapshots"):
+        while not job.wait(0.5):
+            print(f"\rBuilding weekly snapshots… {len(job.done)}/{job.total}", end="", flush=True)
+    if job.status == "done" and job.total:
+        print(f"\rBuilt {job.total} weekly snapshot(s) in {job.to_dict()['elapsed']:.1f}s")
+    elif job.status == "failed":
+        print(f"\rSnapshot generation failed ({job.error}); PPoints uses current ratings for missing weeks")
+
+    with profiling.stage("analytics"):
+        derived = cached_analytics(team_list, games, ratings, conference_map, args.year,
+                                   snapshot_method="hybrid", games_hash=games_hash)
+    recs, sos, mom, pp = derived["records"], derived["sos"], derived["momentum"], derived["ppoints"]
+
     # Build combined table
     rows = []
     for team, val in ratings.items():
@@ -88,5 +115,31 @@ def main():
         print(f"{i:<4} {row['team']:<28} {row['rating']:.4f}   {row['record']:<8} "
               f"{row['sos']:.4f}   {row['momentum']:.3f}   {row['ppoints']:.2f}")
 
+    if args.movers or args.trajectory:
+        with profiling.stage("history"):
+            history = load_rank_history(args.year, "hybrid")  # weekly snapshots are always hybrid
+
+    if args.movers:
+        moves = history.movers(n=10)
+        if history.weeks.size:
+            print(f"\nBiggest movers into week {history.weeks[-1]} (hybrid)\n")
+        for label, items in (("Risers", moves["risers"]), ("Fallers", moves["fallers"])):
+            print(f"{label:<28} {'Prev':>5} {'Now':>5} {'Move':>5}")
+            print("-" * 46)
+            for team, before, after, delta in items:
+                print(f"{team:<28} {before:>5} {after:>5} {delta:>+5}")
+            print()
+
+    if args.trajectory:
+        if args.trajectory not in history.team_index:
+            print(f"\nNo weekly snapshots for {args.trajectory}")
+        else:
+            weeks, ranks, values = history.trajectory(args.trajectory)
+            print(f"\n{args.trajectory} — weekly rank ({args.year}, hybrid)\n")
+            print(f"{'Week':<6} {'Rank':>5} {'Rating':>9}")
+            print("-" * 22)
+            for w, rk, v in zip(weeks, ranks, values):
+                print(f"{w:<6} {'—' if rk == UNRANKED else rk:>5} {v:>9.4f}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
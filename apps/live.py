@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+import os
+from cfbratings.config import settings
+from cfbratings.live import LiveSession, SSEBroadcaster, file_subscriber
+from cfbratings.ratings import METHODS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live game-day ratings: poll for finals and push updates")
+    parser.add_argument("--year", type=int, default=settings.year)
+    parser.add_argument("--season_type", type=str, default=settings.season_type)
+    parser.add_argument("--method", type=str, default="hybrid", choices=METHODS)
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between polls")
+    parser.add_argument("--out", type=str, default=os.path.join(settings.cache_dir, "live_ratings.json"),
+                        help="File rewritten on every update")
+    parser.add_argument("--sse-port", type=int, default=None,
+                        help="Serve /events (server-sent events) and /ratings on this port")
+    parser.add_argument("--base-url", type=str, default=settings.base_url, help="Games API base URL")
+    args = parser.parse_args()
+
+    subscribers = [file_subscriber(args.out)]
+    sse = None
+    if args.sse_port is not None:
+        sse = SSEBroadcaster(port=args.sse_port)
+        subscribers.append(sse)
+        print(f"Streaming updates on http://127.0.0.1:{sse.port}/events")
+
+    session = LiveSession(args.year, method=args.method, season_type=args.season_type,
+                          base_url=args.base_url, subscribers=subscribers)
+    session.publish([])
+    print(f"Watching {args.year} ({session.model.n_games} completed games cached), polling every {args.interval:.0f}s")
+    try:
+        asyncio.run(session.run(interval=args.interval))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if sse:
+            sse.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import argparse
+import os
+import time
+from cfbratings.config import settings
+from cfbratings.io import fetch_teams, fetch_games_slim
+from cfbratings.ratings import METHODS, compute_ratings
+from cfbratings.analytics import records
+from cfbratings.viz.charts import render_charts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render weekly chart assets headlessly")
+    parser.add_argument("--years", type=int, nargs="+", default=[settings.year])
+    parser.add_argument("--methods", type=str, nargs="+", default=METHODS, choices=METHODS)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--conference-top", type=int, default=10, help="Teams per conference chart")
+    parser.add_argument("--formats", type=str, nargs="+", default=["png"], choices=["png", "svg"])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", type=str, default=os.path.join(settings.cache_dir, "charts"))
+    parser.add_argument("--no-cache", action="store_true", help="Re-render even if inputs are unchanged")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    jobs = []
+    for year in args.years:
+        teams = fetch_teams(year)
+        games = fetch_games_slim(year, season_type=settings.season_type)
+        team_list = [t["school"] for t in teams]
+        conference_map = {t["school"]: t.get("conference") for t in teams}
+        recs = records(team_list, games)
+        for method in args.methods:
+            ratings = compute_ratings(method, team_list, games)
+            jobs.append({"name": f"{year}_{method}_top{args.top}", "ratings": ratings, "records": recs,
+                         "n": args.top, "title": f"{year} FBS — {method.capitalize()} Top {args.top}"})
+            for conf in sorted({c for c in conference_map.values() if c}):
+                conf_ratings = {t: r for t, r in ratings.items() if conference_map.get(t) == conf}
+                slug = conf.lower().replace(" ", "-")
+                jobs.append({"name": f"{year}_{method}_{slug}", "ratings": conf_ratings, "records": recs,
+                             "n": min(args.conference_top, len(conf_ratings)),
+                             "title": f"{year} {conf} — {method.capitalize()}"})
+
+    result = render_charts(jobs, args.out, formats=tuple(args.formats), workers=args.workers,
+                           use_cache=not args.no_cache)
+    print(f"{len(result['rendered'])} charts rendered, {len(result['skipped'])} unchanged "
+          f"→ {args.out} ({time.perf_counter() - t0:.1f}s)")
+
+if __name__ == "__main__":
+    main()
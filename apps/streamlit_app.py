@@ -1,11 +1,15 @@
+import time
 import streamlit as st
+from cfbratings import profiling
 from cfbratings.config import settings
-from cfbratings.io import fetch_teams, fetch_games, ensure_snapshots
-from cfbratings.models.colley import build_colley, solve_colley
-from cfbratings.models.massey import build_massey, solve_massey
-from cfbratings.models.elo import run_elo
-from cfbratings.models.hybrid import hybrid_rating
-from cfbratings.analytics import records, strength_of_schedule, momentum, ppoints
+from cfbratings.io import fetch_teams, fetch_games_slim
+from cfbratings.jobs import submit_snapshots
+from cfbratings.ratings import METHODS
+from cfbratings.results_cache import games_fingerprint, cached_ratings, cached_analytics
+from cfbratings.schedule import compile_schedule
+from cfbratings.history import UNRANKED, load_rank_history
+from cfbratings.resume import build_game_graph
+from cfbratings.analytics import records, strength_of_schedule, momentum
 
 st.set_page_config(page_title="CFB Ratings Dashboard", layout="wide")
 
@@ -16,14 +20,16 @@ with col1:
 with col2:
     season_type = st.selectbox("Season type", options=["regular", "postseason", "both"], index=["regular","postseason","both"].index(settings.season_type))
 with col3:
-    method = st.selectbox("Method", options=["colley", "massey", "elo", "hybrid"], index=["colley","massey","elo","hybrid"].index("hybrid"))
+    method = st.selectbox("Method", options=METHODS, index=METHODS.index("hybrid"))
 
 refresh = st.checkbox("Force refresh API (overwrite cache)", value=False)
+diagnostics = st.checkbox("Diagnostics (profile this run)", value=settings.profile)
+profiling.start(diagnostics)  # this session's script run only
 
-teams = fetch_teams(year, force_refresh=refresh)
-conference_map = {t["school"]: t.get("conference") for t in teams}
-games_payload = fetch_games(year, season_type=season_type, force_refresh=refresh)
-games = games_payload["data"] if isinstance(games_payload, dict) and "data" in games_payload else games_payload
+with profiling.stage("fetch"):
+    teams = fetch_teams(year, force_refresh=refresh)
+    conference_map = {t["school"]: t.get("conference") for t in teams}
+    games = fetch_games_slim(year, season_type=season_type, force_refresh=refresh)
 team_list = [t["school"] for t in teams]
 
 # Controls for method hyperparameters
@@ -35,29 +41,37 @@ with st.expander("Advanced settings"):
     elo_reg = st.slider("Elo regress-to-mean", 0.0, 0.5, settings.elo_regress_to_mean, 0.01)
     elo_init = st.slider("Elo initial rating", 1200.0, 1800.0, settings.elo_init, 25.0)
     blend_colley = st.slider("Hybrid weight — Colley", 0.0, 1.0, 0.5, 0.05)
-    blend_massey = 1.0 - blend_colley
+    recency_decay = st.slider("Recency decay per week (Colley/Massey)", 0.0, 0.5, settings.recency_decay, 0.01)
+    use_margin_scale = st.checkbox("Diminishing-returns margins (Colley/Massey)", value=settings.margin_scale is not None)
+    margin_scale = st.slider("Margin scale (points)", 1.0, 35.0, settings.margin_scale or 14.0, 1.0) if use_margin_scale else None
 
-# Compute ratings
-if method == "colley":
-    C, b = build_colley(team_list, games, prior_strength=colley_prior)
-    r = solve_colley(C, b)
-    ratings = {team_list[i]: float(r[i]) for i in range(len(team_list))}
-elif method == "massey":
-    M, mb = build_massey(team_list, games, ridge_lambda=massey_lambda, hfa=hfa)
-    r = solve_massey(M, mb)
-    ratings = {team_list[i]: float(r[i]) for i in range(len(team_list))}
-elif method == "elo":
-    ratings = run_elo(team_list, games, init=elo_init, k=elo_k, regress_to_mean=elo_reg, hfa=hfa)
-else:
-    ratings = hybrid_rating(team_list, games,
-                            colley_weight=blend_colley, massey_weight=blend_massey,
-                            prior_strength=colley_prior, ridge_lambda=massey_lambda, hfa=hfa)
+# Compute ratings (served from the results cache for settings seen before);
+# Colley/Massey re-weighting works on the compiled game arrays
+games_hash = games_fingerprint(games)
+with profiling.stage("ratings"):
+    schedule = compile_schedule(team_list, games)
+    ratings = cached_ratings(method, team_list, games, games_hash=games_hash, hfa=hfa, prior_strength=colley_prior,
+                             ridge_lambda=massey_lambda, elo_k=elo_k, elo_regress=elo_reg,
+                             elo_init=elo_init, colley_weight=blend_colley,
+                             recency_decay=recency_decay, margin_scale=margin_scale, schedule=schedule)
 
-ensure_snapshots(year, method=method)
-recs = records(team_list, games)
-sos = strength_of_schedule(team_list, games, ratings)
-mom = momentum(team_list, games, ratings)
-pp = ppoints(team_list, games, ratings, conference_map)
+# Weekly snapshots build in the background: ratings render right away and the
+# PPoints and history panels fill in once every week is written
+with profiling.stage("snapshots"):
+    job = submit_snapshots(year, method="hybrid")  # PPoints reads hybrid snapshots for every method
+snapshots_ready = job.ready
+with profiling.stage("analytics"):
+    if snapshots_ready:
+        derived = cached_analytics(team_list, games, ratings, conference_map, year,
+                                   snapshot_method="hybrid", games_hash=games_hash)
+    else:
+        derived = {"records": records(team_list, games), "sos": strength_of_schedule(team_list, games, ratings),
+                   "momentum": momentum(team_list, games, ratings), "ppoints": None}
+recs, sos, mom, pp = derived["records"], derived["sos"], derived["momentum"], derived["ppoints"]
+if not snapshots_ready:
+    st.progress(job.progress, text=f"Building weekly snapshots… {len(job.done)}/{job.total} weeks")
+elif job.status == "failed":
+    st.warning(f"Weekly snapshots could not be built ({job.error}); PPoints uses current ratings for missing weeks.")
 
 # Table
 st.subheader(f"Top 25 — {method.capitalize()} ({year}, {season_type})")
@@ -69,7 +83,7 @@ st.dataframe({
     "Record": [f"{recs[t][0]}-{recs[t][1]}" for t,_ in top_items],
     "SOS": [sos[t] for t,_ in top_items],
     "Momentum": [mom[t] for t,_ in top_items],
-    "PPoints": [pp[t] for t,_ in top_items]
+    "PPoints": [pp[t] if pp else None for t,_ in top_items]
 })
 
 # Chart
@@ -86,6 +100,34 @@ fig = px.bar(x=df["Rating"], y=[f"{i+1}. {team} ({rec})" for i,(team,rec) in enu
              labels={"x":"Rating","y":"Team","color":"SOS"}, height=700)
 st.plotly_chart(fig, use_container_width=True)
 
+# Weekly rank trends
+st.subheader("Rank trends (hybrid)")
+history = None
+if snapshots_ready:
+    with profiling.stage("history"):
+        history = load_rank_history(year, "hybrid")  # weekly snapshots are always hybrid
+if history is not None and history.weeks.size:
+    trend_teams = st.multiselect("Teams", options=sorted(history.teams),
+                                 default=[t for t, _ in top_items[:5] if t in history.team_index])
+    trend = {"Week": [], "Rank": [], "Team": []}
+    for team in trend_teams:
+        weeks, ranks, _ = history.trajectory(team)
+        ranked = ranks != UNRANKED
+        trend["Week"] += weeks[ranked].tolist()
+        trend["Rank"] += ranks[ranked].tolist()
+        trend["Team"] += [team] * int(ranked.sum())
+    trend_fig = px.line(trend, x="Week", y="Rank", color="Team", markers=True, height=450)
+    trend_fig.update_yaxes(autorange="reversed")
+    st.plotly_chart(trend_fig, use_container_width=True)
+    moves = history.movers(n=5)
+    mcol1, mcol2 = st.columns(2)
+    mcol1.write({"Risers": [f"{t}: {b} → {a} (+{d})" for t, b, a, d in moves["risers"]]})
+    mcol2.write({"Fallers": [f"{t}: {b} → {a} ({d})" for t, b, a, d in moves["fallers"]]})
+elif not snapshots_ready:
+    st.caption("Rank trends appear once the weekly snapshots are built.")
+else:
+    st.caption("No weekly snapshots yet.")
+
 # Team details
 st.subheader("Team detail")
 team_sel = st.selectbox("Select team", options=sorted(team_list))
@@ -94,4 +136,64 @@ st.write({
     "Record": f"{recs[team_sel][0]}-{recs[team_sel][1]}",
     "SOS": sos.get(team_sel, 0.0),
     "Momentum": mom.get(team_sel, 0.0)
-})
\ No newline at end of file
+})
+
+# Résumé: every query is answered for all teams at once from the indexed game graph
+with profiling.stage("resume"):
+    graph = build_game_graph(team_list, games, ratings, history=history, schedule=schedule)
+    k = graph.team_index[team_sel]
+    tier_wins, tier_losses = graph.record_by_tier((10, 25, 50))
+if history is None:
+    st.caption("Game-time ranks use current ratings until the weekly snapshots are built.")
+elif method != "hybrid":
+    st.caption("Game-time ranks come from the weekly hybrid snapshots.")
+rcol1, rcol2 = st.columns(2)
+with rcol1:
+    st.write({
+        "Wins over top 25 (at game time)": int(graph.quality_wins(25)[k]),
+        "Losses outside top 50 (at game time)": int(graph.bad_losses(50)[k]),
+        "Record vs 1-10 / 11-25 / 26-50 / rest": " / ".join(
+            f"{w}-{l}" for w, l in zip(tier_wins[k], tier_losses[k])),
+    })
+with rcol2:
+    games_sel = graph.games_of(team_sel)
+    st.dataframe({
+        "Week": [f"{g['week']} (post)" if g["postseason"] else str(g["week"]) for g in games_sel],
+        "Opponent": [("vs " if g["home"] else "@ ") + g["opponent"] for g in games_sel],
+        "Opp. rank then": [g["opp_rank"] for g in games_sel],
+        "Margin": [g["margin"] for g in games_sel],
+    })
+other = st.selectbox("Compare with", options=[t for t in sorted(team_list) if t != team_sel])
+common = graph.common_opponents(team_sel, other) if other else []
+if common:
+    st.caption(f"Common opponents: {team_sel} {sum(a for _, a, _ in common) / len(common):+.1f} "
+               f"vs {other} {sum(b for _, _, b in common) / len(common):+.1f} average margin")
+    st.dataframe({
+        "Opponent": [c for c, _, _ in common],
+        team_sel: [a for _, a, _ in common],
+        other: [b for _, _, b in common],
+    })
+else:
+    st.caption("No common opponents.")
+for a, b in ((team_sel, other), (other, team_sel)) if other else ():
+    chain = graph.win_chain(a, b)
+    if chain:
+        st.write(f"Win chain: {' → '.join(chain)}")
+
+# Diagnostics
+if profiling.is_enabled():
+    with st.expander("Diagnostics", expanded=True):
+        rep = profiling.report()
+        st.caption(f"Run time {rep['wall']:.3f}s")
+        st.dataframe({
+            "Stage": list(rep["stages"]),
+            "Calls": [s["calls"] for s in rep["stages"].values()],
+            "Total (s)": [s["total"] for s in rep["stages"].values()],
+            "Mean (ms)": [s["mean"] * 1000 for s in rep["stages"].values()],
+        })
+        st.json({"counters": rep["counters"], "gauges": rep["gauges"]})
+
+# Poll the snapshot job and rerun so the pending panels fill in
+if not snapshots_ready:
+    time.sleep(1.0)
+    st.rerun()
@@ -3,6 +3,7 @@ from statistics import mean
 import numpy as np
 from cfbratings.config import settings
 from cfbratings.io import load_weekly_ratings
+from cfbratings.schedule import Schedule, compile_schedule, rank_vector
 from statistics import median
 from typing import Dict, List, Tuple
 
@@ -136,8 +137,110 @@ def compute_conference_strength_robust(
     }
     return conf_strength
 
-def ppoints(team_list, games, ratings, conference_map, method="hybrid", weight_current=0.5):
+def encode_conferences(teams: List[str], conference_map: Dict[str, str]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Assign each team an integer conference code for the array-based strength functions.
+
+    Teams missing from conference_map are grouped under "Unknown", matching
+    compute_conference_strength_robust.
+
+    Returns:
+        Tuple of (codes array aligned with teams, conference names indexed by code)
+    """
+    conf_index: Dict[str, int] = {}
+    codes = np.empty(len(teams), dtype=np.intp)
+    for k, team in enumerate(teams):
+        conf = conference_map.get(team, "Unknown")
+        codes[k] = conf_index.setdefault(conf, len(conf_index))
+    return codes, list(conf_index)
+
+def conference_strength_matrix(
+    ratings: np.ndarray,
+    codes: np.ndarray,
+    n_conf: int | None = None,
+    top_percent: float = 0.35,
+    mid_lo: float = 0.40,
+    mid_hi: float = 0.60,
+    elite_weight: float = 0.65,
+    depth_weight: float = 0.35,
+) -> np.ndarray:
+    """
+    Robust conference strength for many rating snapshots at once.
+
+    Array counterpart of compute_conference_strength_robust: every conference's
+    elite and depth medians are taken from one grouped sort of each row.
+
+    Args:
+        ratings: weeks×teams rating matrix; NaN marks a team absent from that week
+        codes: Conference code per team column (see encode_conferences)
+        n_conf: Number of conference codes (default codes.max() + 1)
+
+    Returns:
+        weeks×conferences strength matrix. Conferences with no rated teams in a
+        week get 1.0, the default ppoints uses for unknown conferences.
+    """
+    R = np.atleast_2d(np.asarray(ratings, dtype=float))
+    codes = np.asarray(codes, dtype=np.intp)
+    if n_conf is None:
+        n_conf = int(codes.max()) + 1 if codes.size else 0
+    W = R.shape[0]
+    out = np.ones((W, n_conf))
+    if W == 0 or codes.size == 0 or n_conf == 0:
+        return out
+
+    # Group columns by conference, then sort each group; NaNs sort to the end of their group
+    order = np.argsort(codes, kind="stable")
+    grouped = R[:, order]
+    within = np.lexsort((grouped, np.broadcast_to(codes[order], grouped.shape)), axis=-1)
+    vals = np.take_along_axis(grouped, within, axis=1)
+
+    sizes = np.bincount(codes, minlength=n_conf)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    onehot = np.zeros((codes.size, n_conf))
+    onehot[np.arange(codes.size), codes] = 1.0
+    n = (~np.isnan(R)).astype(float) @ onehot
+    n = n.astype(np.intp)
+    nf = n.astype(float)
+    present = n > 0
+
+    def seg_median(a, b):
+        length = b - a
+        i0 = np.clip(starts + a + (length - 1) // 2, 0, vals.shape[1] - 1)
+        i1 = np.clip(starts + a + length // 2, 0, vals.shape[1] - 1)
+        return (np.take_along_axis(vals, i0, axis=1) + np.take_along_axis(vals, i1, axis=1)) / 2
+
+    # Elite median: median of top_percent slice
+    cut = np.maximum((nf * (1 - top_percent)).astype(np.intp), 0)
+    elite_med = seg_median(np.where(cut < n, cut, n - 1), n)
+
+    # Depth median: median of middle band, falling back to the whole conference
+    lo_idx = np.maximum((nf * mid_lo).astype(np.intp), 0)
+    hi_idx = np.minimum((nf * mid_hi).astype(np.intp), n)
+    depth_a = lo_idx
+    depth_b = np.where(hi_idx > lo_idx, hi_idx, np.minimum(lo_idx + 1, n))
+    empty = depth_b <= depth_a
+    depth_med = seg_median(np.where(empty, 0, depth_a), np.where(empty, n, depth_b))
+
+    score = elite_weight * elite_med + depth_weight * depth_med
+
+    # Scale to wider band for separation, per week over the conferences present
+    src_min = np.where(present, score, np.inf).min(axis=1, keepdims=True)
+    src_max = np.where(present, score, -np.inf).max(axis=1, keepdims=True)
+    spread = src_max > src_min
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = (score - src_min) / (src_max - src_min)
+    scaled = np.where(spread, 0.6 + t * (1.6 - 0.6), 1.0)
+    out[present] = scaled[present]
+    return out
+
+def conference_strength_vector(ratings: np.ndarray, codes: np.ndarray, n_conf: int | None = None, **kwargs) -> np.ndarray:
+    """Single-snapshot form of conference_strength_matrix; returns one strength per conference code."""
+    return conference_strength_matrix(np.asarray(ratings, dtype=float)[None, :], codes, n_conf, **kwargs)[0]
+
+def ppoints(team_list, games, ratings, conference_map, method="hybrid", weight_current=0.5, year: int | None = None):
     scores = {t: 0.0 for t in team_list}
+    # Season whose weekly snapshots supply game-time ranks
+    year = settings.year if year is None else year
 
     # Current conference strength (end of season snapshot)
     current_conf_strength = compute_conference_strength_robust(ratings, conference_map)
@@ -166,7 +269,7 @@ def ppoints(team_list, games, ratings, conference_map, method="hybrid", weight_c
         week = g.get("week", 0)
 
         # Weekly ratings snapshot for game-time rank
-        week_ratings = load_weekly_ratings(settings.year, week, method) or ratings
+        week_ratings = load_weekly_ratings(year, week, method) or ratings
         sorted_week = sorted(week_ratings.items(), key=lambda kv: kv[1], reverse=True)
         week_rank_map = {team: rank+1 for rank, (team, _) in enumerate(sorted_week)}
 
@@ -212,4 +315,118 @@ def ppoints(team_list, games, ratings, conference_map, method="hybrid", weight_c
                 scores[home] -= loss_penalty_factor / max(opp_points_away, 1.0)
 
 
-    return scores
\ No newline at end of file
+    return scores
+
+
+_TIER_BOUNDS = np.array([10, 25, 40, 60])
+_TIER_POINTS = np.array([8, 5, 3, 2, 1])
+
+def _rank_row(week_ratings: Dict[str, float], team_to_idx: Dict[str, int], n: int) -> np.ndarray:
+    # Ranks over the full snapshot (teams outside team_list still take a slot); 1000 if unranked
+    row = np.full(n, 1000, dtype=np.int64)
+    ranks = rank_vector(list(week_ratings.values()))
+    for team, rank in zip(week_ratings, ranks):
+        k = team_to_idx.get(team)
+        if k is not None:
+            row[k] = rank
+    return row
+
+def ppoints_tables(sched: Schedule, ratings: Dict[str, float], conference_map: Dict[str, str],
+                   method: str = "hybrid", year: int | None = None):
+    """
+    Build the lookup tables ppoints_fast gathers from.
+
+    Each distinct game week gets a row holding that week's snapshot ranks (weeks×teams)
+    and conference strengths (weeks×game conferences, plus a trailing 1.0 column for
+    games with no conference). Weeks without a snapshot fall back to ratings.
+
+    Returns:
+        Tuple of (week_row per game, week_rank, current_rank, week_conf, current_conf)
+    """
+    year = settings.year if year is None else year
+    team_to_idx = {t: i for i, t in enumerate(sched.teams)}
+    weeks, week_row = np.unique(sched.week, return_inverse=True)
+    snapshots = []
+    for w in weeks:
+        snap = load_weekly_ratings(year, int(w), method) if w >= 0 else None
+        snapshots.append(snap or ratings)
+    snapshots.append(ratings)  # last row: current
+
+    rank = np.vstack([_rank_row(s, team_to_idx, sched.n_teams) for s in snapshots]) if sched.teams else \
+        np.zeros((len(snapshots), 0), dtype=np.int64)
+
+    # Conference strength for every snapshot in one batched call over the union of rated teams
+    universe: Dict[str, int] = {}
+    for s in snapshots:
+        for team in s:
+            universe.setdefault(team, len(universe))
+    R = np.full((len(snapshots), len(universe)), np.nan)
+    for row, s in enumerate(snapshots):
+        R[row, [universe[t] for t in s]] = list(s.values())
+    codes, names = encode_conferences(list(universe), conference_map)
+    strength = conference_strength_matrix(R, codes, len(names))
+    name_to_code = {c: k for k, c in enumerate(names)}
+    conf = np.ones((len(snapshots), len(sched.conferences) + 1))
+    for k, c in enumerate(sched.conferences):
+        if c in name_to_code:
+            conf[:, k] = strength[:, name_to_code[c]]
+
+    return week_row, rank[:-1], rank[-1], conf[:-1], conf[-1]
+
+def ppoints_fast(team_list, games, ratings, conference_map, method="hybrid", weight_current=0.5,
+                 year: int | None = None, schedule: Schedule | None = None):
+    """
+    Vectorized ppoints over a compiled schedule; reproduces ppoints exactly.
+
+    weight_current may be a scalar (returns a team→score dict like ppoints) or a
+    sequence of weights (returns a weights×teams array aligned with team_list),
+    so many blends can be scored from one set of tables.
+    """
+    sched = schedule if schedule is not None else compile_schedule(team_list, games)
+    row, week_rank, current_rank, week_conf, current_conf = ppoints_tables(
+        sched, ratings, conference_map, method=method, year=year)
+
+    scalar = np.ndim(weight_current) == 0
+    wc = np.atleast_1d(np.asarray(weight_current, dtype=float))[:, None]
+    h, a = sched.home, sched.away
+
+    # Tier points at game time vs current
+    game_points_home = _TIER_POINTS[np.searchsorted(_TIER_BOUNDS, week_rank[row, a])]
+    game_points_away = _TIER_POINTS[np.searchsorted(_TIER_BOUNDS, week_rank[row, h])]
+    current_points_home = _TIER_POINTS[np.searchsorted(_TIER_BOUNDS, current_rank[a])]
+    current_points_away = _TIER_POINTS[np.searchsorted(_TIER_BOUNDS, current_rank[h])]
+
+    opp_points_home = (1 - wc) * game_points_home + wc * current_points_home
+    opp_points_away = (1 - wc) * game_points_away + wc * current_points_away
+    base_home = opp_points_home * 1.00
+    base_away = opp_points_away * 1.20
+
+    # Conference strength blending; code -1 gathers the trailing 1.0 column
+    hc, ac = sched.home_conf, sched.away_conf
+    home_strength = np.where(hc >= 0, (1 - wc) * week_conf[row, hc] + wc * current_conf[hc], 1.0)
+    away_strength = np.where(ac >= 0, (1 - wc) * week_conf[row, ac] + wc * current_conf[ac], 1.0)
+    base_home = base_home * away_strength
+    base_away = base_away * home_strength
+
+    nonconf = sched.nonconference
+    loss_penalty_factor = np.where(nonconf, 2.0, 4.0)
+    extra_win_factor = np.where(nonconf, 1.5, 1.0)
+
+    home_win = sched.home_points > sched.away_points
+    decided = home_win | (sched.away_points > sched.home_points)
+    gain = np.where(home_win, extra_win_factor * base_home, extra_win_factor * base_away)
+    penalty = np.where(home_win, loss_penalty_factor / np.maximum(opp_points_home, 1.0),
+                       loss_penalty_factor / np.maximum(opp_points_away, 1.0))
+
+    # Scatter-add in game order: winner gains, loser is penalized
+    winner = np.where(home_win, h, a)[decided]
+    loser = np.where(home_win, a, h)[decided]
+    idx = np.column_stack([winner, loser]).ravel()
+    vals = np.stack([gain[:, decided], -penalty[:, decided]], axis=2).reshape(len(wc), -1)
+    scores = np.zeros((len(wc), len(team_list)))
+    for k in range(len(wc)):
+        np.add.at(scores[k], idx, vals[k])
+
+    if scalar:
+        return {team_list[i]: float(scores[0, i]) for i in range(len(team_list))}
+    return scores
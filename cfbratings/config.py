@@ -19,5 +19,10 @@ class Settings:
     elo_k: float = float(os.getenv("CFB_ELO_K", "25"))
     elo_regress_to_mean: float = float(os.getenv("CFB_ELO_REGRESS", "0.20"))
     elo_init: float = float(os.getenv("CFB_ELO_INIT", "1500"))
+    recency_decay: float = float(os.getenv("CFB_RECENCY_DECAY", "0"))  # per week; 0 = equal weights
+    margin_scale: float | None = float(os.getenv("CFB_MARGIN_SCALE")) if os.getenv("CFB_MARGIN_SCALE") else None
+    results_cache_mb: int = int(os.getenv("CFB_RESULTS_CACHE_MB", "256"))  # disk cap for computed results; 0 = memory only
+    # Diagnostics
+    profile: bool = os.getenv("CFB_PROFILE", "0").lower() in ("1", "true", "yes")
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,171 @@
+import glob
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+import numpy as np
+from .config import settings
+from .io import load_weekly_ratings
+from .schedule import rank_vector
+from . import profiling
+
+UNRANKED = 1000  # rank for a team missing from a week's snapshot (same default ppoints uses)
+
+@dataclass
+class RankHistory:
+    """
+    Dense weekly rating and rank matrices for one season's snapshots.
+
+    Rows are snapshot weeks (ascending), columns are teams. Ratings missing
+    from a week are NaN and their rank is UNRANKED. Ranks follow the snapshot's
+    own order for ties, matching ppoints.
+    """
+    year: int
+    method: str
+    teams: List[str]
+    weeks: np.ndarray                      # (W,)
+    ratings: np.ndarray                    # (W, T)
+    ranks: np.ndarray                      # (W, T)
+    mtimes: np.ndarray                     # (W,) snapshot file mtimes, for refresh
+    team_index: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.team_index = {t: i for i, t in enumerate(self.teams)}
+
+    def row(self, week: int) -> int:
+        k = int(np.searchsorted(self.weeks, week))
+        if k == len(self.weeks) or self.weeks[k] != week:
+            raise KeyError(f"No snapshot for week {week}")
+        return k
+
+    def movers(self, week: int | None = None, prev_week: int | None = None, n: int = 10) -> Dict[str, List[Tuple[str, int, int, int]]]:
+        """
+        Biggest rank changes between two weeks (default: the last two snapshots).
+
+        Returns:
+            {"risers": [...], "fallers": [...]} of (team, previous rank, rank, places moved)
+        """
+        if len(self.weeks) < 2:
+            return {"risers": [], "fallers": []}
+        cur = self.row(week) if week is not None else len(self.weeks) - 1
+        prev = self.row(prev_week) if prev_week is not None else max(cur - 1, 0)
+        before, after = self.ranks[prev], self.ranks[cur]
+        ranked = (before != UNRANKED) & (after != UNRANKED)
+        delta = np.where(ranked, before - after, 0)
+        order = np.argsort(-delta, kind="stable")
+        def pick(idx):
+            return [(self.teams[i], int(before[i]), int(after[i]), int(delta[i])) for i in idx]
+        risers = [i for i in order[:n] if delta[i] > 0]
+        fallers = [i for i in order[::-1][:n] if delta[i] < 0]
+        return {"risers": pick(risers), "fallers": pick(fallers)}
+
+    def trajectory(self, team: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(weeks, ranks, ratings) for one team across the season."""
+        k = self.team_index[team]
+        return self.weeks, self.ranks[:, k], self.ratings[:, k]
+
+    def weeks_in_top(self, n: int = 10) -> Dict[str, int]:
+        """Number of weekly snapshots each team spent ranked n or better."""
+        counts = (self.ranks <= n).sum(axis=0)
+        return {t: int(counts[i]) for i, t in enumerate(self.teams)}
+
+    def rank_at(self, teams: np.ndarray, weeks: np.ndarray) -> np.ndarray:
+        """
+        Vectorized game-time rank lookup.
+
+        Args:
+            teams: Team column indices
+            weeks: Week per lookup; weeks without a snapshot give UNRANKED
+        """
+        teams = np.asarray(teams, dtype=np.intp)
+        weeks = np.asarray(weeks)
+        if len(self.weeks) == 0:
+            return np.full(teams.shape, UNRANKED, dtype=np.int64)
+        k = np.clip(np.searchsorted(self.weeks, weeks), 0, len(self.weeks) - 1)
+        found = self.weeks[k] == weeks
+        return np.where(found, self.ranks[k, teams], UNRANKED)
+
+def _index_path(year: int, method: str) -> str:
+    return os.path.join(settings.cache_dir, f"history_{year}_{method}.npz")
+
+def _snapshot_files(year: int, method: str) -> Dict[int, str]:
+    pattern = os.path.join(settings.cache_dir, f"ratings_{year}_{method}_week*.json")
+    found = {}
+    for path in glob.glob(pattern):
+        m = re.search(r"_week(\d+)\.json$", path)
+        if m:
+            found[int(m.group(1))] = path
+    return found
+
+def _load_index(year: int, method: str) -> RankHistory | None:
+    path = _index_path(year, method)
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as z:
+        return RankHistory(year=year, method=method, teams=[str(t) for t in z["teams"]],
+                           weeks=z["weeks"], ratings=z["ratings"], ranks=z["ranks"], mtimes=z["mtimes"])
+
+def _save_index(h: RankHistory) -> None:
+    os.makedirs(settings.cache_dir, exist_ok=True)
+    np.savez(_index_path(h.year, h.method), teams=np.array(h.teams, dtype=str), weeks=h.weeks,
+             ratings=h.ratings, ranks=h.ranks, mtimes=h.mtimes)
+
+def load_rank_history(year: int, method: str = "hybrid", refresh: bool = True) -> RankHistory:
+    """
+    Rank-history index for a season, built from the weekly snapshots.
+
+    The index is persisted next to the snapshots; on refresh only weeks whose
+    snapshot file is new or has changed since the last build are re-read.
+    Snapshots always hold hybrid ratings (see io.compute_snapshot), so this is
+    the hybrid rank history; method only names the snapshot files to read.
+    """
+    h = _load_index(year, method)
+    if h is None:
+        h = RankHistory(year=year, method=method, teams=[], weeks=np.zeros(0, dtype=np.int64),
+                        ratings=np.zeros((0, 0)), ranks=np.zeros((0, 0), dtype=np.int64),
+                        mtimes=np.zeros(0))
+    elif not refresh:
+        return h
+
+    files = _snapshot_files(year, method)
+    known = {int(w): float(m) for w, m in zip(h.weeks, h.mtimes)}
+    stale = sorted(w for w, p in files.items() if known.get(w) != os.path.getmtime(p))
+    dropped = [w for w in known if w not in files]
+    if not stale and not dropped:
+        return h
+
+    with profiling.stage("history.refresh"):
+        keep = [w for w in sorted(known) if w in files and w not in stale]
+        rows = {w: (h.ratings[h.row(w)], h.ranks[h.row(w)]) for w in keep}
+        teams = list(h.teams)
+        team_index = dict(h.team_index)
+        loaded = {}
+        for w in stale:
+            snap = load_weekly_ratings(year, w, method) or {}
+            for t in snap:
+                if t not in team_index:
+                    team_index[t] = len(teams)
+                    teams.append(t)
+            loaded[w] = snap
+        profiling.count("history.weeks_loaded", len(stale))
+
+        weeks = sorted(keep + stale)
+        T = len(teams)
+        ratings = np.full((len(weeks), T), np.nan)
+        ranks = np.full((len(weeks), T), UNRANKED, dtype=np.int64)
+        for k, w in enumerate(weeks):
+            if w in rows:
+                r, rk = rows[w]
+                ratings[k, :len(r)] = r
+                ranks[k, :len(rk)] = rk
+            else:
+                snap = loaded[w]
+                cols = [team_index[t] for t in snap]
+                ratings[k, cols] = list(snap.values())
+                ranks[k, cols] = rank_vector(list(snap.values()))
+
+        h = RankHistory(year=year, method=method, teams=teams, weeks=np.array(weeks, dtype=np.int64),
+                        ratings=ratings, ranks=ranks,
+                        mtimes=np.array([os.path.getmtime(files[w]) for w in weeks]))
+        _save_index(h)
+    return h
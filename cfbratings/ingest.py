@@ -0,0 +1,69 @@
+import sys
+from typing import Any, Dict, Iterable, List
+from . import profiling
+
+# The only CFBD game fields the models and analytics read
+GAME_FIELDS = (
+    "id", "season", "week", "seasonType", "completed",
+    "homeTeam", "awayTeam", "homePoints", "awayPoints",
+    "homeConference", "awayConference", "neutralSite",
+)
+_INTERNED = ("seasonType", "homeTeam", "awayTeam", "homeConference", "awayConference")
+
+class GameRecord:
+    """
+    Compact game record holding only GAME_FIELDS.
+
+    Supports the read side of the dict protocol (get, [], in) with CFBD key
+    names, so it can be passed anywhere a raw game dict is accepted. A field
+    that was missing or null in the source is stored as None and get() returns
+    its default for it.
+    """
+    __slots__ = GAME_FIELDS
+
+    def __init__(self, *values):
+        for name, value in zip(GAME_FIELDS, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_dict(cls, game: Dict[str, Any]) -> "GameRecord":
+        rec = cls(*(game.get(f) for f in GAME_FIELDS))
+        for f in _INTERNED:
+            v = getattr(rec, f)
+            if isinstance(v, str):
+                setattr(rec, f, sys.intern(v))
+        return rec
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key not in GAME_FIELDS:
+            return default
+        v = getattr(self, key)
+        return default if v is None else v
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in GAME_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in GAME_FIELDS and getattr(self, key) is not None
+
+    def values(self) -> List[Any]:
+        return [getattr(self, f) for f in GAME_FIELDS]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(GAME_FIELDS, self.values()))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, GameRecord) and self.values() == other.values()
+
+    def __repr__(self) -> str:
+        return (f"GameRecord({self.season} wk{self.week}: {self.awayTeam} {self.awayPoints} "
+                f"@ {self.homeTeam} {self.homePoints})")
+
+def project_games(games: Iterable[Dict[str, Any]]) -> List[GameRecord]:
+    """Project raw CFBD game dicts to GameRecords with interned team and conference names."""
+    with profiling.stage("ingest.project"):
+        out = [GameRecord.from_dict(g) for g in games]
+    profiling.count("ingest.games", len(out))
+    return out
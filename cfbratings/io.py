@@ -5,6 +5,8 @@ from typing import Any, Dict, List
 import requests
 from .config import settings
 from .models.hybrid import hybrid_rating
+from . import profiling
+from .ingest import GAME_FIELDS, GameRecord, project_games
 
 
 def _ensure_dir(path: str) -> None:
@@ -18,7 +20,7 @@ def _cache_path(kind: str, year: int, season_type: str = "both") -> str:
 def _read_cache(path: str) -> Any:
     if not os.path.exists(path):
         return None
-    with open(path, "r", encoding="utf-8") as f:
+    with profiling.stage("cache.parse"), open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 def _write_cache(path: str, obj: Any) -> None:
@@ -30,11 +32,14 @@ def fetch_teams(year: int, force_refresh: bool = False) -> List[Dict[str, Any]]:
     if not force_refresh:
         cached = _read_cache(path)
         if cached:
+            profiling.count("cache.hits")
             return cached
+    profiling.count("cache.misses")
     if not settings.api_key:
         raise RuntimeError("CFBD_API_KEY not set")
     url = f"{settings.base_url}/teams/fbs?year={year}"
-    resp = requests.get(url, headers={"Authorization": f"Bearer {settings.api_key}"}, timeout=settings.timeout)
+    with profiling.stage("fetch.teams"):
+        resp = requests.get(url, headers={"Authorization": f"Bearer {settings.api_key}"}, timeout=settings.timeout)
     resp.raise_for_status()
     data = resp.json()
     _write_cache(path, data)
@@ -45,11 +50,14 @@ def fetch_games(year: int, season_type: str = "both", force_refresh: bool = Fals
     if not force_refresh:
         cached = _read_cache(path)
         if cached:
+            profiling.count("cache.hits")
             return cached
+    profiling.count("cache.misses")
     if not settings.api_key:
         raise RuntimeError("CFBD_API_KEY not set")
     url = f"{settings.base_url}/games?year={year}&seasonType={season_type}"
-    resp = requests.get(url, headers={"Authorization": f"Bearer {settings.api_key}"}, timeout=settings.timeout)
+    with profiling.stage("fetch.games"):
+        resp = requests.get(url, headers={"Authorization": f"Bearer {settings.api_key}"}, timeout=settings.timeout)
     resp.raise_for_status()
     data = resp.json()
     # Optional: keep a timestamp for staleness checks
@@ -57,6 +65,35 @@ def fetch_games(year: int, season_type: str = "both", force_refresh: bool = Fals
     _write_cache(path, payload)
     return payload
 
+def _slim_path(year: int, season_type: str) -> str:
+    return _cache_path("games", year, season_type)[:-len(".json")] + ".slim.json"
+
+def fetch_games_slim(year: int, season_type: str = "both", force_refresh: bool = False) -> List[GameRecord]:
+    """
+    Games for a season as GameRecords.
+
+    The projection is persisted next to the raw cache and rebuilt whenever the
+    raw cache is newer, so the raw payload is only parsed once per refresh.
+    """
+    raw_path = _cache_path("games", year, season_type)
+    slim_path = _slim_path(year, season_type)
+    fresh = (not force_refresh and os.path.exists(slim_path) and os.path.exists(raw_path)
+             and os.path.getmtime(slim_path) >= os.path.getmtime(raw_path))
+    if fresh:
+        profiling.count("cache.hits")
+        with profiling.stage("cache.parse"), open(slim_path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("fields") == list(GAME_FIELDS):
+            return [GameRecord.from_dict(dict(zip(GAME_FIELDS, row))) for row in payload["rows"]]
+
+    games_payload = fetch_games(year, season_type=season_type, force_refresh=force_refresh)
+    games = games_payload["data"] if isinstance(games_payload, dict) and "data" in games_payload else games_payload
+    records = project_games(games)
+    with open(slim_path, "w", encoding="utf-8") as f:
+        json.dump({"_cached_at": int(time.time()), "fields": list(GAME_FIELDS),
+                   "rows": [r.values() for r in records]}, f, separators=(",", ":"))
+    return records
+
 def save_weekly_ratings(year: int, week: int, method: str, ratings: dict):
     path = os.path.join(settings.cache_dir, f"ratings_{year}_{method}_week{week}.json")
     os.makedirs(settings.cache_dir, exist_ok=True)
@@ -70,24 +107,26 @@ def load_weekly_ratings(year: int, week: int, method: str) -> dict | None:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def ensure_snapshots(year: int, method: str = "hybrid") -> None:
-    teams = fetch_teams(year)
-    games_payload = fetch_games(year, season_type="both")
-    games = games_payload["data"]
-
-    team_list = [t["school"] for t in teams]
+def snapshot_weeks(games: List[Any]) -> List[int]:
+    """Weeks 1..latest completed week, i.e. every week a season's snapshots cover."""
     completed_games = [g for g in games if g.get("completed", False)]
     max_week = max((g.get("week", 0) for g in completed_games), default=0)
+    return list(range(1, max_week + 1))
 
-    if max_week == 0:
-        return  # No completed games, nothing to snapshot
+def missing_snapshot_weeks(year: int, method: str, games: List[Any]) -> List[int]:
+    """Snapshot weeks with no cached file yet."""
+    missing = []
+    for week in snapshot_weeks(games):
+        if os.path.exists(os.path.join(settings.cache_dir, f"ratings_{year}_{method}_week{week}.json")):
+            profiling.count("snapshots.cached")
+        else:
+            missing.append(week)
+    return missing
 
-    for week in range(1, max_week + 1):
-        fname = os.path.join(settings.cache_dir, f"ratings_{year}_{method}_week{week}.json")
-        if os.path.exists(fname):
-            continue  # already cached
-
-        week_games = [g for g in games if g.get("week", 0) <= week and g.get("completed", False)]
+def compute_snapshot(year: int, week: int, method: str, team_list: List[str], games: List[Any]) -> Dict[str, float]:
+    """Rate the season through `week` and cache it as that week's snapshot. Weeks are independent."""
+    week_games = [g for g in games if g.get("week", 0) <= week and g.get("completed", False)]
+    with profiling.stage("snapshots.week"):
         ratings = hybrid_rating(
             team_list,
             week_games,
@@ -97,5 +136,16 @@ def ensure_snapshots(year: int, method: str = "hybrid") -> None:
             ridge_lambda=settings.massey_ridge_lambda,
             hfa=settings.home_field_adv,
         )
-        save_weekly_ratings(year, week, method, ratings)
-        print(f"Cached weekly ratings → {fname}")
\ No newline at end of file
+    profiling.count("snapshots.computed")
+    save_weekly_ratings(year, week, method, ratings)
+    return ratings
+
+def ensure_snapshots(year: int, method: str = "hybrid") -> None:
+    teams = fetch_teams(year)
+    games = fetch_games_slim(year, season_type="both")
+
+    team_list = [t["school"] for t in teams]
+    for week in missing_snapshot_weeks(year, method, games):
+        compute_snapshot(year, week, method, team_list, games)
+        fname = os.path.join(settings.cache_dir, f"ratings_{year}_{method}_week{week}.json")
+        print(f"Cached weekly ratings → {fname}")
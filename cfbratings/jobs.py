@@ -0,0 +1,172 @@
+import contextvars
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+from .config import Settings
+from .io import compute_snapshot, fetch_teams, fetch_games_slim, missing_snapshot_weeks
+from . import io, profiling
+
+# Worker-process state: each job's pool is seeded once with the season instead of per week
+_worker_season: Tuple[List[str], List[Any]] | None = None
+
+def _init_worker(team_list: List[str], games: List[Any], cfg: Settings) -> None:
+    # Spawned workers re-import the package, so carry over the parent's settings (cache dir, model parameters)
+    global _worker_season
+    _worker_season = (team_list, games)
+    io.settings = cfg
+
+def _snapshot_week(year: int, week: int, method: str, season: Tuple[List[str], List[Any]] | None = None) -> int:
+    team_list, games = season or _worker_season
+    compute_snapshot(year, week, method, team_list, games)
+    return week
+
+@dataclass
+class SnapshotJob:
+    """
+    Background generation of one season's missing weekly snapshots.
+
+    Status moves pending → running → done (or failed). Weeks are independent
+    and finish in any order; `done` lists the weeks written so far.
+    """
+    year: int
+    method: str
+    weeks: List[int] = field(default_factory=list)
+    done: List[int] = field(default_factory=list)
+    status: str = "pending"
+    error: str | None = None
+    started: float = field(default_factory=time.time)
+    finished: float | None = None
+    _event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def total(self) -> int:
+        return len(self.weeks)
+
+    @property
+    def ready(self) -> bool:
+        """True once the job has stopped, successfully or not."""
+        return self._event.is_set()
+
+    @property
+    def progress(self) -> float:
+        """Fraction of weeks written (1.0 when there was nothing to do)."""
+        return len(self.done) / self.total if self.total else float(self.status == "done")
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until the job stops; returns False on timeout."""
+        return self._event.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "year": self.year, "method": self.method, "status": self.status,
+            "done": len(self.done), "total": self.total, "error": self.error,
+            "elapsed": (self.finished or time.time()) - self.started,
+        }
+
+class SnapshotJobs:
+    """
+    Runs snapshot jobs in the background, one per (year, method) at a time.
+
+    Submitting a (year, method) that is already being generated returns the
+    running job instead of starting a second one. Each job fans its missing
+    weeks out over a worker pool (processes by default, since the model
+    builders hold the GIL) from a coordinator thread, so submit() returns
+    as soon as the missing weeks are known.
+    """
+
+    def __init__(self, workers: int | None = None, processes: bool = True):
+        self.workers = workers or os.cpu_count() or 1
+        self.processes = processes
+        self._jobs: Dict[Tuple[int, str], SnapshotJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, year: int, method: str = "hybrid", team_list: List[str] | None = None,
+               games: List[Any] | None = None,
+               on_progress: Callable[[SnapshotJob], None] | None = None) -> SnapshotJob:
+        """
+        Start (or join) snapshot generation for a season.
+
+        Finding the missing weeks is done up front (it reads the cached season),
+        so a season whose snapshots are complete comes back already done; the
+        weeks themselves are computed in the background.
+        """
+        key = (year, method)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not job.ready:
+                profiling.count("jobs.deduplicated")
+                return job
+            job = SnapshotJob(year=year, method=method)
+            self._jobs[key] = job
+        try:
+            if team_list is None:
+                team_list = [t["school"] for t in fetch_teams(year)]
+            if games is None:
+                games = fetch_games_slim(year, season_type="both")
+            job.weeks = missing_snapshot_weeks(year, method, games)
+        except Exception as e:
+            self._finish(job, e)
+            return job
+        if not job.weeks:
+            self._finish(job)
+            return job
+        job.status = "running"
+        # The coordinator records into the submitting run's profiler
+        ctx = contextvars.copy_context()
+        thread = threading.Thread(target=ctx.run, args=(self._run, job, team_list, games, on_progress),
+                                  name=f"snapshots-{year}-{method}", daemon=True)
+        thread.start()
+        return job
+
+    def get(self, year: int, method: str = "hybrid") -> SnapshotJob | None:
+        with self._lock:
+            return self._jobs.get((year, method))
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Status of every job submitted so far."""
+        with self._lock:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def _run(self, job: SnapshotJob, team_list: List[str], games: List[Any],
+             on_progress: Callable[[SnapshotJob], None] | None) -> None:
+        try:
+            workers = min(self.workers, len(job.weeks))
+            if self.processes and workers > 1:
+                # Spawned, not forked: forking from this coordinator thread would copy
+                # whatever locks other threads of the host (e.g. a Streamlit server) hold
+                pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                           initializer=_init_worker, initargs=(team_list, games, io.settings))
+                season = None
+            else:
+                pool = ThreadPoolExecutor(max_workers=workers)
+                season = (team_list, games)
+            with pool:
+                # Latest weeks first: they are the most expensive and the ones ppoints reads most
+                futures = [pool.submit(_snapshot_week, job.year, w, job.method, season)
+                           for w in sorted(job.weeks, reverse=True)]
+                for fut in as_completed(futures):
+                    job.done.append(fut.result())
+                    if on_progress:
+                        on_progress(job)
+        except Exception as e:  # surfaced through the job's status, never raised into the caller
+            self._finish(job, e)
+        else:
+            self._finish(job)
+
+    @staticmethod
+    def _finish(job: SnapshotJob, error: Exception | None = None) -> None:
+        job.status = "failed" if error else "done"
+        job.error = f"{type(error).__name__}: {error}" if error else None
+        job.finished = time.time()
+        profiling.gauge("jobs.snapshot_seconds", job.finished - job.started)
+        job._event.set()
+
+snapshot_jobs = SnapshotJobs()
+
+def submit_snapshots(year: int, method: str = "hybrid", **kwargs) -> SnapshotJob:
+    """Generate a season's missing snapshots in the background with the shared job runner."""
+    return snapshot_jobs.submit(year, method, **kwargs)
@@ -0,0 +1,326 @@
+import asyncio
+import json
+import math
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List
+import numpy as np
+import requests
+from .config import settings
+from .io import _cache_path, _write_cache, fetch_teams, fetch_games_slim
+from .ingest import project_games
+from .models.colley import solve_colley
+from .models.massey import solve_massey
+from .models.hybrid import zscore
+from . import profiling
+
+class IncrementalRatings:
+    """
+    Colley, Massey and Elo state that absorbs games one at a time.
+
+    Colley keeps its win/loss/opponent tallies and Massey keeps AᵀA and Aᵀy, so
+    adding a game is O(1) and a rating refresh is a single solve. Elo is replayed
+    forward from where it stopped; a late game that sorts before the last one
+    processed triggers a full Elo replay instead.
+    """
+
+    def __init__(self, team_list: List[str], prior_strength: float = settings.colley_prior_strength,
+                 ridge_lambda: float = settings.massey_ridge_lambda, hfa: float = settings.home_field_adv,
+                 max_margin: float = 50.0, elo_init: float = settings.elo_init, elo_k: float = settings.elo_k,
+                 elo_regress: float = settings.elo_regress_to_mean):
+        n = len(team_list)
+        self.team_list = list(team_list)
+        self.team_to_idx = {t: i for i, t in enumerate(team_list)}
+        self.prior_strength = prior_strength
+        self.ridge_lambda = ridge_lambda
+        self.hfa = hfa
+        self.max_margin = max_margin
+        self.elo_init = elo_init; self.elo_k = elo_k; self.elo_regress = elo_regress
+
+        self.wins = np.zeros(n); self.losses = np.zeros(n); self.games_played = np.zeros(n)
+        self.opponents = np.zeros((n, n))
+        self.AtA = np.zeros((n, n)); self.Aty = np.zeros(n)
+        self.n_games = 0
+
+        self.games: List[Any] = []
+        self.elo = {t: elo_init for t in team_list}
+        self._elo_week = None
+        self._elo_last_key = None
+
+    @staticmethod
+    def _order_key(g):
+        return (g.get("season", 0), g.get("week", 0), g.get("id", 0))
+
+    def add_games(self, games: List[Any]) -> int:
+        """Absorb completed games; returns how many were usable by the models."""
+        usable = []
+        for g in games:
+            if not g.get("completed", False):
+                continue
+            hp = g.get("homePoints"); ap = g.get("awayPoints")
+            if hp is None or ap is None:
+                continue
+            i = self.team_to_idx.get(g["homeTeam"]); j = self.team_to_idx.get(g["awayTeam"])
+            if i is None or j is None:
+                continue
+            self.games.append(g)
+            usable.append(g)
+
+            # Colley tallies
+            self.games_played[i] += 1; self.games_played[j] += 1
+            self.opponents[i, j] += 1; self.opponents[j, i] += 1
+            if hp > ap:
+                self.wins[i] += 1; self.losses[j] += 1
+            elif ap > hp:
+                self.wins[j] += 1; self.losses[i] += 1
+            else:
+                self.wins[i] += 0.5; self.wins[j] += 0.5
+                self.losses[i] += 0.5; self.losses[j] += 0.5
+
+            # Massey normal equations (row e_i - e_j)
+            margin = float(np.clip((hp - ap) - self.hfa, -self.max_margin, self.max_margin))
+            self.AtA[i, i] += 1; self.AtA[j, j] += 1
+            self.AtA[i, j] -= 1; self.AtA[j, i] -= 1
+            self.Aty[i] += margin; self.Aty[j] -= margin
+            self.n_games += 1
+
+        if usable:
+            self._advance_elo(usable)
+        profiling.count("live.games_added", len(usable))
+        return len(usable)
+
+    def _advance_elo(self, new_games: List[Any]) -> None:
+        pending = sorted(new_games, key=self._order_key)
+        if self._elo_last_key is not None and self._order_key(pending[0]) < self._elo_last_key:
+            # A game landed before the Elo frontier: replay the season in order
+            self.elo = {t: self.elo_init for t in self.team_list}
+            self._elo_week = None
+            pending = sorted(self.games, key=self._order_key)
+
+        mean = self.elo_init
+        for g in pending:
+            w = g.get("week")
+            if self._elo_week is None:
+                self._elo_week = w
+            elif w is not None and w != self._elo_week:
+                for t in self.elo:
+                    self.elo[t] = self.elo[t] * (1 - self.elo_regress) + mean * self.elo_regress
+                self._elo_week = w
+            hp = g.get("homePoints"); ap = g.get("awayPoints")
+            home = g["homeTeam"]; away = g["awayTeam"]
+            Rh = self.elo[home] + self.hfa
+            Ra = self.elo[away]
+            exp_h = 1.0 / (1.0 + 10 ** ((Ra - Rh) / 400.0))
+            out_h = 1.0 if hp > ap else 0.0 if ap > hp else 0.5
+            margin = abs(hp - ap)
+            mult = math.log(max(margin, 1) + 1) * (2.2 / ((Rh - Ra) * 0.001 + 2.2))
+            delta = self.elo_k * mult * (out_h - exp_h)
+            self.elo[home] += delta
+            self.elo[away] -= delta
+            self._elo_last_key = self._order_key(g)
+
+    def colley(self) -> np.ndarray:
+        n = len(self.team_list)
+        if n == 0:
+            return np.array([])
+        C = np.diag(self.prior_strength + self.games_played) - self.opponents
+        b = (self.prior_strength / 2.0) + 0.5 * (self.wins - self.losses)
+        return solve_colley(C, b)
+
+    def massey(self) -> np.ndarray:
+        n = len(self.team_list)
+        if n == 0:
+            return np.array([])
+        if self.n_games == 0:
+            return solve_massey(np.zeros((n, n)), np.zeros(n))
+        M = self.AtA + self.ridge_lambda * np.eye(n)
+        b = self.Aty.copy()
+        M[-1, :] = 1.0
+        b[-1] = 0.0
+        return solve_massey(M, b)
+
+    def ratings(self, method: str = "hybrid", colley_weight: float = 0.5) -> Dict[str, float]:
+        if method == "elo":
+            return dict(self.elo)
+        if method == "colley":
+            r = self.colley()
+        elif method == "massey":
+            r = self.massey()
+        elif method == "hybrid":
+            r = colley_weight * zscore(self.colley()) + (1.0 - colley_weight) * zscore(self.massey())
+        else:
+            raise ValueError(f"Unknown rating method: {method}")
+        return {self.team_list[i]: float(r[i]) for i in range(len(self.team_list))}
+
+# Subscribers receive each published update dict
+
+def file_subscriber(path: str) -> Callable[[Dict[str, Any]], None]:
+    """Write every update to path (atomically, via a temp file and rename)."""
+    def publish(update: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(update, f, indent=2)
+        os.replace(tmp, path)
+    return publish
+
+class SSEBroadcaster:
+    """
+    Server-sent-events endpoint for live updates.
+
+    GET /events streams one "ratings" event per update; GET /ratings returns
+    the latest update as JSON. Instances are subscribers themselves.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765):
+        self.latest: Dict[str, Any] | None = None
+        self._clients: List[queue.Queue] = []
+        self._lock = threading.Lock()
+        broadcaster = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.startswith("/ratings"):
+                    body = json.dumps(broadcaster.latest or {}).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                if not self.path.startswith("/events"):
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                q = broadcaster._subscribe()
+                try:
+                    while True:
+                        try:
+                            data = q.get(timeout=15)
+                            self.wfile.write(f"event: ratings\ndata: {data}\n\n".encode())
+                        except queue.Empty:
+                            self.wfile.write(b": keep-alive\n\n")
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    broadcaster._unsubscribe(q)
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def _subscribe(self) -> queue.Queue:
+        q: queue.Queue = queue.Queue()
+        with self._lock:
+            self._clients.append(q)
+        return q
+
+    def _unsubscribe(self, q: queue.Queue) -> None:
+        with self._lock:
+            if q in self._clients:
+                self._clients.remove(q)
+
+    def __call__(self, update: Dict[str, Any]) -> None:
+        self.latest = update
+        data = json.dumps(update)
+        with self._lock:
+            for q in self._clients:
+                q.put(data)
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+class LiveSession:
+    """
+    Game-day polling loop for one season.
+
+    Seeds incremental models from the cached season, then polls the games
+    endpoint, diffs by game id and feeds only newly completed games to the
+    models before publishing the refreshed ratings to every subscriber.
+    """
+
+    def __init__(self, year: int, method: str = "hybrid", season_type: str = "both",
+                 base_url: str | None = None, api_key: str | None = None,
+                 subscribers: List[Callable[[Dict[str, Any]], None]] | None = None,
+                 persist: bool = True, team_list: List[str] | None = None, games: List[Any] | None = None):
+        self.year = year
+        self.method = method
+        self.season_type = season_type
+        self.base_url = base_url or settings.base_url
+        self.api_key = settings.api_key if api_key is None else api_key
+        self.subscribers = list(subscribers or [])
+        self.persist = persist
+
+        if team_list is None:
+            team_list = [t["school"] for t in fetch_teams(year)]
+        if games is None:
+            games = fetch_games_slim(year, season_type=season_type)
+        self.model = IncrementalRatings(team_list)
+        self.completed_ids = {g.get("id") for g in games if g.get("completed", False)}
+        self.model.add_games(games)
+
+    def _fetch(self) -> List[Dict[str, Any]]:
+        url = f"{self.base_url}/games?year={self.year}&seasonType={self.season_type}"
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        resp = requests.get(url, headers=headers, timeout=settings.timeout)
+        resp.raise_for_status()
+        return resp.json()
+
+    def publish(self, new_games: List[Any]) -> Dict[str, Any]:
+        update = {
+            "year": self.year,
+            "method": self.method,
+            "published_at": time.time(),
+            "games": self.model.n_games,
+            "new_games": [g.get("id") for g in new_games],
+            "ratings": self.model.ratings(self.method),
+        }
+        for sub in self.subscribers:
+            sub(update)
+        return update
+
+    async def step(self) -> Dict[str, Any] | None:
+        """Poll once; returns the published update, or None if nothing new finished."""
+        with profiling.stage("live.poll"):
+            data = await asyncio.to_thread(self._fetch)
+        fresh = [g for g in data if g.get("completed", False) and g.get("id") not in self.completed_ids]
+        if not fresh:
+            return None
+        new_games = project_games(fresh)
+        self.completed_ids.update(g.get("id") for g in fresh)
+        with profiling.stage("live.update"):
+            self.model.add_games(new_games)
+            update = self.publish(new_games)
+        if self.persist:
+            _write_cache(_cache_path("games", self.year, self.season_type),
+                         {"_cached_at": int(time.time()), "data": data})
+        return update
+
+    async def run(self, interval: float = 60.0, stop: asyncio.Event | None = None) -> None:
+        """Poll every interval seconds until stop is set; poll errors are reported and retried."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                update = await self.step()
+                if update:
+                    print(f"{time.strftime('%H:%M:%S')} {len(update['new_games'])} new final(s) → "
+                          f"ratings updated ({update['games']} games)")
+            except requests.RequestException as e:
+                print(f"{time.strftime('%H:%M:%S')} poll failed: {e}")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
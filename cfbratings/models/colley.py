@@ -1,7 +1,13 @@
 import numpy as np
 from typing import Dict, List, Tuple
+from .. import profiling
+from .components import solve_by_component
+from ..schedule import chronological_week, last_regular_week
+from .weighted import last_scored_week, margin_weight, recency_weight
 
-def build_colley(team_list: List[str], games: List[dict], prior_strength: float = 2.0) -> Tuple[np.ndarray, np.ndarray]:
+@profiling.timed("colley.build")
+def build_colley(team_list: List[str], games: List[dict], prior_strength: float = 2.0,
+                 recency_decay: float = 0.0, margin_scale: float | None = None) -> Tuple[np.ndarray, np.ndarray]:
     """
     Build Colley matrix for ranking teams.
 
@@ -9,6 +15,8 @@ def build_colley(team_list: List[str], games: List[dict], prior_strength: float
         team_list: List of team names
         games: List of game dictionaries
         prior_strength: Prior strength parameter (default 2.0)
+        recency_decay: Per-week decay so early-season games count less (default 0, equal weights)
+        margin_scale: Weight games by 1 + log(1 + |margin|/margin_scale) (default None, unweighted)
 
     Returns:
         Tuple of (C matrix, b vector) for solving C·r = b
@@ -22,6 +30,8 @@ def build_colley(team_list: List[str], games: List[dict], prior_strength: float
     losses = np.zeros(n, dtype=float)
     games_played = np.zeros(n, dtype=float)
     opponent_matrix = np.zeros((n, n), dtype=float)
+    last_week = last_scored_week(team_list, games) if recency_decay else 0
+    last_regular = last_regular_week(games) if recency_decay else 0
 
     for g in games:
         game = g if isinstance(g, dict) else g
@@ -38,34 +48,40 @@ def build_colley(team_list: List[str], games: List[dict], prior_strength: float
         if home not in team_to_idx or away not in team_to_idx:
             continue
         i = team_to_idx[home]; j = team_to_idx[away]
+        w = 1.0
+        if recency_decay:
+            w *= float(recency_weight(chronological_week(game, last_regular), last_week, recency_decay))
+        if margin_scale is not None:
+            w *= float(margin_weight(hp - ap, margin_scale))
 
-        games_played[i] += 1; games_played[j] += 1
-        opponent_matrix[i, j] += 1; opponent_matrix[j, i] += 1
+        games_played[i] += w; games_played[j] += w
+        opponent_matrix[i, j] += w; opponent_matrix[j, i] += w
 
         if hp > ap:
-            wins[i] += 1; losses[j] += 1
+            wins[i] += w; losses[j] += w
         elif ap > hp:
-            wins[j] += 1; losses[i] += 1
+            wins[j] += w; losses[i] += w
         else:
-            wins[i] += 0.5; wins[j] += 0.5
-            losses[i] += 0.5; losses[j] += 0.5
+            wins[i] += 0.5 * w; wins[j] += 0.5 * w
+            losses[i] += 0.5 * w; losses[j] += 0.5 * w
 
+    if profiling.is_enabled():
+        profiling.count("colley.games", games_played.sum() / 2)
+    profiling.gauge("colley.matrix_n", n)
     C = np.diag(prior_strength + games_played) - opponent_matrix
     b = (prior_strength / 2.0) + 0.5 * (wins - losses)
     return C, b
 
+@profiling.timed("colley.solve")
 def solve_colley(C: np.ndarray, b: np.ndarray) -> np.ndarray:
     """
     Solve the Colley matrix equation C·r = b.
-    Returns default ratings (0.5 for all teams) if matrix is singular.
+    Disconnected schedules (e.g. early season) are solved one connected
+    component at a time; a component whose block is singular gets the
+    default Colley rating of 0.5.
     """
     if len(b) == 0:
         return np.array([])
 
-    try:
-        return np.linalg.solve(C, b)
-    except np.linalg.LinAlgError:
-        # Matrix is singular (e.g., isolated teams or no games)
-        # Return default Colley rating of 0.5 for all teams
-        n = len(b)
-        return np.full(n, 0.5)
\ No newline at end of file
+    profiling.count("solver.calls")
+    return solve_by_component(C, b, fallback=0.5)
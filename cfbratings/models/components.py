@@ -0,0 +1,87 @@
+import numpy as np
+from typing import Tuple
+from .. import profiling
+
+def connected_components(A: np.ndarray, anchored: bool = False) -> Tuple[int, np.ndarray]:
+    """
+    Connected components of the game graph behind a rating system.
+
+    Two teams are linked when their off-diagonal entry is nonzero (in any
+    system of a stack). With anchored=True the last row is a sum-to-zero
+    anchor rather than a game equation and is ignored.
+
+    Returns:
+        Tuple of (number of components, component label per team)
+    """
+    n = A.shape[-1]
+    linked = A != 0
+    if linked.ndim > 2:
+        linked = linked.any(axis=tuple(range(linked.ndim - 2)))
+    if anchored:
+        linked[-1, :] = False
+    i, j = np.divmod(np.flatnonzero(linked), n)  # much faster than 2-D nonzero on dense arrays
+    off = i != j
+    i, j = i[off], j[off]
+
+    # Union-find with hooking and pointer jumping, vectorized over all edges at once:
+    # every root hooks onto the smallest root it touches until no edge spans two roots
+    parent = np.arange(n)
+    while True:
+        ri, rj = parent[i], parent[j]
+        cross = ri != rj
+        if not cross.any():
+            break
+        lo, hi = np.minimum(ri[cross], rj[cross]), np.maximum(ri[cross], rj[cross])
+        np.minimum.at(parent, hi, lo)
+        while True:  # compress every path to its root
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+    _, labels = np.unique(parent, return_inverse=True)
+    return int(labels.max()) + 1 if n else 0, labels
+
+def _solve(A: np.ndarray, b: np.ndarray, fallback: float) -> np.ndarray:
+    # Solve one system or a stack; a singular system yields `fallback` for its teams
+    try:
+        return np.linalg.solve(A, b[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        if A.ndim == 2:
+            return np.full(b.shape, fallback, dtype=float)
+        return np.stack([_solve(A[k], b[k], fallback) for k in range(A.shape[0])])
+
+def solve_by_component(A: np.ndarray, b: np.ndarray, fallback: float, anchored: bool = False) -> np.ndarray:
+    """
+    Solve A·r = b (or a stack of them) one connected component at a time.
+
+    A connected schedule is solved as a single system, exactly as before.
+    Otherwise each component is solved as its own smaller block (blocks of
+    equal size in one batched call); with anchored=True every block is
+    anchored on its highest-index team by requiring the component's ratings
+    to sum to zero. Only a block that is itself singular falls back to
+    `fallback`.
+    """
+    n = A.shape[-1]
+    k, labels = connected_components(A, anchored=anchored)
+    profiling.count("solver.components", k)
+    if k <= 1:
+        return _solve(A, b, fallback)
+
+    order = np.argsort(labels, kind="stable")          # teams grouped by component, ascending within
+    sizes = np.bincount(labels, minlength=k)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    if profiling.is_enabled():
+        profiling.gauge("solver.block_n", int(sizes.max()))
+    out = np.empty(b.shape, dtype=float)
+    for size in np.unique(sizes):
+        comps = np.flatnonzero(sizes == size)
+        idx = order[starts[comps][:, None] + np.arange(size)[None, :]]   # (blocks, size)
+        sub = A[..., idx[:, :, None], idx[:, None, :]]                   # (..., blocks, size, size)
+        sb = b[..., idx]
+        if anchored:
+            anchor = idx[:, -1] != n - 1  # the block holding the last team already carries the anchor row
+            sub[..., anchor, -1, :] = 1.0
+            sb[..., anchor, -1] = 0.0
+        out[..., idx] = _solve(sub, sb, fallback)
+    return out
@@ -1,6 +1,8 @@
 import math
 from typing import Dict, List
+from .. import profiling
 
+@profiling.timed("elo.run")
 def run_elo(team_list: List[str], games: List[dict], init: float = 1500.0, k: float = 25.0,
             regress_to_mean: float = 0.20, hfa: float = 2.1) -> Dict[str, float]:
     """
@@ -30,6 +32,7 @@ def run_elo(team_list: List[str], games: List[dict], init: float = 1500.0, k: fl
     # Process in chronological order if available
     games_sorted = sorted(games, key=lambda g: (g.get("season", 0), g.get("week", 0), g.get("id", 0)))
     week_marker = None
+    processed = 0
 
     for g in games_sorted:
         if not g.get("completed", False):
@@ -66,5 +69,8 @@ def run_elo(team_list: List[str], games: List[dict], init: float = 1500.0, k: fl
         delta = k * mult * (out_h - exp_h)
         ratings[home] += delta
         ratings[away] -= delta
+        processed += 1
+
+    profiling.count("elo.games", processed)
 
     return ratings
\ No newline at end of file
@@ -1,7 +1,13 @@
 import numpy as np
 from typing import List, Dict
+from .. import profiling
+from .components import solve_by_component
+from ..schedule import chronological_week, last_regular_week
+from .weighted import diminish_margin, last_scored_week, recency_weight
 
-def build_massey(team_list: List[str], games: List[dict], ridge_lambda: float = 0.01, hfa: float = 2.1, max_margin: float = 50.0):
+@profiling.timed("massey.build")
+def build_massey(team_list: List[str], games: List[dict], ridge_lambda: float = 0.01, hfa: float = 2.1, max_margin: float = 50.0,
+                 recency_decay: float = 0.0, margin_scale: float | None = None):
     """
     Build Massey rating system matrices.
 
@@ -11,6 +17,8 @@ def build_massey(team_list: List[str], games: List[dict], ridge_lambda: float =
         ridge_lambda: Ridge regularization parameter
         hfa: Home field advantage in points
         max_margin: Maximum margin to prevent outliers (default 50 points)
+        recency_decay: Per-week decay so early-season games count less (default 0, equal weights)
+        margin_scale: Compress margins as scale·log(1 + |margin|/scale) before capping (default None)
     """
     n = len(team_list)
     if n == 0:
@@ -20,6 +28,8 @@ def build_massey(team_list: List[str], games: List[dict], ridge_lambda: float =
     # Massey: A r = y, where A encodes matchups, y = margin (home - away adjusted)
     rows = []
     y = []
+    last_week = last_scored_week(team_list, games) if recency_decay else 0
+    last_regular = last_regular_week(games) if recency_decay else 0
     for g in games:
         if not g.get("completed", False):
             continue
@@ -31,10 +41,16 @@ def build_massey(team_list: List[str], games: List[dict], ridge_lambda: float =
             continue
         i = team_to_idx[home]; j = team_to_idx[away]
         margin = (hp - ap) - hfa  # subtract home-field advantage
+        if margin_scale is not None:
+            margin = float(diminish_margin(margin, margin_scale))
         # Cap extreme margins to reduce impact of blowouts
         margin = np.clip(margin, -max_margin, max_margin)
-        row = np.zeros(n); row[i] = 1.0; row[j] = -1.0
-        rows.append(row); y.append(margin)
+        # Weighted least squares: scale the row and target by sqrt(weight)
+        sw = np.sqrt(recency_weight(chronological_week(g, last_regular), last_week, recency_decay)) if recency_decay else 1.0
+        row = np.zeros(n); row[i] = sw; row[j] = -sw
+        rows.append(row); y.append(sw * margin)
+    profiling.count("massey.games", len(rows))
+    profiling.gauge("massey.matrix_n", n)
     if len(rows) == 0:
         return np.zeros((n, n)), np.zeros(n)
 
@@ -51,18 +67,17 @@ def build_massey(team_list: List[str], games: List[dict], ridge_lambda: float =
     b[-1] = 0.0
     return M, b
 
+@profiling.timed("massey.solve")
 def solve_massey(M: np.ndarray, b: np.ndarray) -> np.ndarray:
     """
     Solve the Massey matrix equation M·r = b.
-    Returns zero ratings for all teams if matrix is singular.
+    Disconnected schedules are solved one connected component at a time,
+    each anchored to sum to zero; a component whose block is singular gets
+    zero ratings (Massey ratings are centered at 0).
     """
     if len(b) == 0:
         return np.array([])
 
-    try:
-        return np.linalg.solve(M, b)
-    except np.linalg.LinAlgError:
-        # Matrix is singular (e.g., isolated teams or degenerate cases)
-        # Return zero ratings (Massey ratings are centered at 0)
-        n = len(b)
-        return np.zeros(n)
\ No newline at end of file
+    profiling.count("solver.calls")
+    anchored = bool(np.all(M[-1, :] == 1.0))  # last row replaced by sum(r) = 0 in build_massey
+    return solve_by_component(M, b, fallback=0.0, anchored=anchored)
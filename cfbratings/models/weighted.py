@@ -0,0 +1,142 @@
+import numpy as np
+from typing import Sequence
+from ..schedule import Schedule, chronological_week, last_regular_week
+from .components import solve_by_component
+
+def recency_weight(week, last_week, decay: float):
+    """Time-decay game weight: exp(-decay · weeks before last_week). decay=0 weights all games 1."""
+    if decay == 0:
+        return np.ones_like(np.asarray(week, dtype=float))
+    return np.exp(-decay * (np.asarray(last_week, dtype=float) - np.asarray(week, dtype=float)))
+
+def margin_weight(margin, scale: float | None):
+    """Diminishing-returns game weight for Colley: 1 + log(1 + |margin|/scale). None weights all games 1."""
+    margin = np.asarray(margin, dtype=float)
+    if scale is None:
+        return np.ones_like(margin)
+    return 1.0 + np.log1p(np.abs(margin) / scale)
+
+def diminish_margin(margin, scale: float | None):
+    """Diminishing-returns Massey margin: sign · scale · log(1 + |margin|/scale). None leaves it unchanged."""
+    margin = np.asarray(margin, dtype=float)
+    if scale is None:
+        return margin
+    return np.sign(margin) * scale * np.log1p(np.abs(margin) / scale)
+
+def last_scored_week(team_list, games) -> int:
+    """Latest chronological week among games the models score (completed, scored, both teams known)."""
+    teams = set(team_list)
+    last_regular = last_regular_week(games)
+    last = 0
+    for g in games:
+        if not g.get("completed", False) or g.get("homePoints") is None or g.get("awayPoints") is None:
+            continue
+        if g["homeTeam"] in teams and g["awayTeam"] in teams:
+            last = max(last, chronological_week(g, last_regular))
+    return last
+
+def game_weights(sched: Schedule, decays: Sequence[float] | float = 0.0, margin_scale: float | None = None,
+                 colley: bool = False) -> np.ndarray:
+    """
+    Per-game weight matrix, one row per decay value.
+
+    Weeks are chronological (postseason after the regular season) and the
+    last week is taken from the schedule, so the most recent games weigh 1.
+    Margin weighting is only folded in for Colley (colley=True); Massey applies
+    it to the margin itself via diminish_margin.
+
+    Returns:
+        decays×games weight matrix
+    """
+    decays = np.atleast_1d(np.asarray(decays, dtype=float))
+    week = np.maximum(sched.chrono_week, 0).astype(float)
+    last = week.max() if week.size else 0.0
+    W = np.exp(-decays[:, None] * (last - week)[None, :])
+    if colley:
+        W = W * margin_weight(sched.margin, margin_scale)[None, :]
+    return W
+
+def _pair_scatter(n: int, i: np.ndarray, j: np.ndarray, W: np.ndarray) -> np.ndarray:
+    # Σ_g w_kg (e_i - e_j)(e_i - e_j)ᵀ for every row k of W, as one bincount over K·n·n cells
+    K, G = W.shape
+    offset = (np.arange(K) * n * n)[:, None]
+    idx = np.concatenate([offset + i * n + i, offset + j * n + j, offset + i * n + j, offset + j * n + i], axis=1)
+    vals = np.concatenate([W, W, -W, -W], axis=1)
+    # astype: bincount returns int64 when there are no games at all
+    return np.bincount(idx.ravel(), weights=vals.ravel(), minlength=K * n * n).astype(float).reshape(K, n, n)
+
+def _team_scatter(n: int, idx: np.ndarray, W: np.ndarray) -> np.ndarray:
+    K = W.shape[0]
+    flat = (np.arange(K) * n)[:, None] + idx[None, :]
+    return np.bincount(flat.ravel(), weights=W.ravel(), minlength=K * n).astype(float).reshape(K, n)
+
+def colley_systems(sched: Schedule, weights: np.ndarray, prior_strength: float = 2.0):
+    """
+    Weighted Colley systems for every row of weights, assembled without touching game dicts.
+
+    Returns:
+        Tuple of (K×n×n C stack, K×n b stack)
+    """
+    n = sched.n_teams
+    W = np.atleast_2d(weights)
+    i, j = sched.home, sched.away
+    C = _pair_scatter(n, i, j, W)
+    C += prior_strength * np.eye(n)[None, :, :]
+    hw = sched.home_points > sched.away_points
+    aw = sched.away_points > sched.home_points
+    # wins - losses: winner +w, loser -w, ties cancel
+    sign = np.where(hw, 1.0, np.where(aw, -1.0, 0.0))
+    diff = _team_scatter(n, i, W * sign) - _team_scatter(n, j, W * sign)
+    b = (prior_strength / 2.0) + 0.5 * diff
+    return C, b
+
+def massey_systems(sched: Schedule, weights: np.ndarray, ridge_lambda: float = 0.01, hfa: float = 2.1,
+                   max_margin: float = 50.0, margin_scale: float | None = None):
+    """
+    Weighted Massey normal equations (AᵀWA + λI, AᵀWy) for every row of weights, mean-anchored.
+
+    Returns:
+        Tuple of (K×n×n M stack, K×n b stack)
+    """
+    n = sched.n_teams
+    W = np.atleast_2d(weights)
+    i, j = sched.home, sched.away
+    y = np.clip(diminish_margin(sched.margin - hfa, margin_scale), -max_margin, max_margin)
+    M = _pair_scatter(n, i, j, W)
+    M += ridge_lambda * np.eye(n)[None, :, :]
+    b = _team_scatter(n, i, W * y) - _team_scatter(n, j, W * y)
+    if sched.n_games == 0:
+        return np.zeros_like(M), np.zeros_like(b)
+    M[:, -1, :] = 1.0
+    b[:, -1] = 0.0
+    return M, b
+
+def solve_systems(A: np.ndarray, b: np.ndarray, fallback: float, anchored: bool = False) -> np.ndarray:
+    """Batched solve of K systems, component by component; a singular block yields `fallback` for its teams."""
+    if A.shape[-1] == 0:
+        return np.zeros(b.shape)
+    return solve_by_component(A, b, fallback, anchored=anchored)
+
+def sweep_recency(sched: Schedule, decays: Sequence[float], method: str = "massey",
+                  prior_strength: float = 2.0, ridge_lambda: float = 0.01, hfa: float = 2.1,
+                  max_margin: float = 50.0, margin_scale: float | None = None) -> np.ndarray:
+    """
+    Ratings for many recency decays at once.
+
+    The schedule's incidence structure is fixed; only the game weights change,
+    so every decay's system is assembled by one scatter and solved in one
+    batched call.
+
+    Returns:
+        decays×teams rating matrix
+    """
+    if method == "colley":
+        W = game_weights(sched, decays, margin_scale, colley=True)
+        C, b = colley_systems(sched, W, prior_strength=prior_strength)
+        return solve_systems(C, b, fallback=0.5)
+    if method == "massey":
+        W = game_weights(sched, decays)
+        M, b = massey_systems(sched, W, ridge_lambda=ridge_lambda, hfa=hfa, max_margin=max_margin,
+                              margin_scale=margin_scale)
+        return solve_systems(M, b, fallback=0.0, anchored=sched.n_games > 0)
+    raise ValueError(f"Recency sweeps support colley and massey, not {method}")
@@ -0,0 +1,147 @@
+import cProfile
+import functools
+import json
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, Dict
+
+# Opt-in instrumentation. Measurements go to the Recorder active in the current
+# context (one per CLI run or dashboard script run, so concurrent sessions never
+# mix); with none active every hook is a lookup and returns, so the calls can
+# stay in hot paths.
+_null = nullcontext()
+
+class Recorder:
+    """Stage timings, counters and gauges of one run."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, list] = {}      # name -> [calls, total seconds, max seconds]
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}     # name -> largest value seen
+
+    def add_time(self, name: str, dt: float) -> None:
+        entry = self.stages.setdefault(name, [0, 0.0, 0.0])
+        entry[0] += 1; entry[1] += dt
+        if dt > entry[2]:
+            entry[2] = dt
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "wall": time.perf_counter() - self.started,
+            "stages": {
+                name: {"calls": calls, "total": total, "mean": total / calls if calls else 0.0, "max": worst}
+                for name, (calls, total, worst) in sorted(self.stages.items(), key=lambda kv: -kv[1][1])
+            },
+            "counters": dict(sorted(self.counters.items())),
+            "gauges": dict(sorted(self.gauges.items())),
+        }
+
+_current: ContextVar[Recorder | None] = ContextVar("cfbratings_profiler", default=None)
+
+def start(enabled: bool = True) -> Recorder | None:
+    """
+    Begin a run: activate a fresh Recorder in the current context (or none when
+    disabled) and return it. Suits scripts that cannot wrap their body in a
+    with block, such as a Streamlit script run; otherwise use recording().
+    """
+    rec = Recorder() if enabled else None
+    _current.set(rec)
+    return rec
+
+@contextmanager
+def recording(enabled: bool = True):
+    """Record the body into a fresh Recorder (yielded; None when disabled)."""
+    rec = Recorder() if enabled else None
+    token = _current.set(rec)
+    try:
+        yield rec
+    finally:
+        _current.reset(token)
+
+def current() -> Recorder | None:
+    return _current.get()
+
+def is_enabled() -> bool:
+    return _current.get() is not None
+
+@contextmanager
+def _timed(rec: Recorder, name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        rec.add_time(name, time.perf_counter() - t0)
+
+def stage(name: str):
+    """Context manager timing a named stage; a shared no-op when profiling is off."""
+    rec = _current.get()
+    if rec is None:
+        return _null
+    return _timed(rec, name)
+
+def timed(name: str):
+    """Decorator form of stage for whole functions (model builds and solves)."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            rec = _current.get()
+            if rec is None:
+                return fn(*args, **kwargs)
+            with _timed(rec, name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+def count(name: str, n: float = 1) -> None:
+    """Add n to a named counter (games processed, cache hits, solver calls...)."""
+    rec = _current.get()
+    if rec is None:
+        return
+    rec.counters[name] = rec.counters.get(name, 0) + n
+
+def gauge(name: str, value: float) -> None:
+    """Record a size-like value, keeping the largest seen (e.g. matrix dimension)."""
+    rec = _current.get()
+    if rec is None:
+        return
+    if value > rec.gauges.get(name, float("-inf")):
+        rec.gauges[name] = value
+
+def report() -> Dict[str, Any]:
+    """Structured snapshot of everything recorded in the current run."""
+    rec = _current.get()
+    if rec is None:
+        return {"enabled": False, "wall": 0.0, "stages": {}, "counters": {}, "gauges": {}}
+    return rec.report()
+
+def write_report(path: str) -> Dict[str, Any]:
+    rep = report()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rep, f, indent=2)
+    return rep
+
+def format_report(rep: Dict[str, Any]) -> str:
+    lines = [f"{'Stage':<32} {'Calls':>6} {'Total s':>9} {'Mean ms':>9}", "-" * 60]
+    for name, s in rep["stages"].items():
+        lines.append(f"{name:<32} {s['calls']:>6} {s['total']:>9.3f} {s['mean'] * 1000:>9.2f}")
+    for name, v in {**rep["counters"], **rep["gauges"]}.items():
+        lines.append(f"{name:<32} {v:>g}")
+    lines.append(f"{'wall':<32} {rep['wall']:.3f}s")
+    return "\n".join(lines)
+
+@contextmanager
+def cprofile(path: str | None):
+    """Run the body under cProfile and dump stats to path (no-op when path is None)."""
+    if not path:
+        yield
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(path)
@@ -0,0 +1,65 @@
+from typing import Dict, List
+from .config import settings
+from .models.colley import build_colley, solve_colley
+from .models.massey import build_massey, solve_massey
+from .models.elo import run_elo
+from .models.hybrid import hybrid_rating, zscore
+from .models.weighted import sweep_recency
+from .schedule import Schedule
+
+METHODS = ["colley", "massey", "elo", "hybrid"]
+
+def compute_ratings(method: str, team_list: List[str], games: List[dict],
+                    hfa: float = settings.home_field_adv,
+                    prior_strength: float = settings.colley_prior_strength,
+                    ridge_lambda: float = settings.massey_ridge_lambda,
+                    elo_k: float = settings.elo_k,
+                    elo_regress: float = settings.elo_regress_to_mean,
+                    elo_init: float = settings.elo_init,
+                    colley_weight: float = 0.5,
+                    recency_decay: float = settings.recency_decay,
+                    margin_scale: float | None = settings.margin_scale,
+                    schedule: Schedule | None = None) -> Dict[str, float]:
+    """
+    Rate teams with the named method.
+
+    Args:
+        method: One of "colley", "massey", "elo", "hybrid"
+        team_list: List of team names
+        games: List of game dictionaries
+        colley_weight: Hybrid blend weight for Colley (Massey gets the rest)
+        recency_decay: Per-week time decay for Colley/Massey (0 = equal weights)
+        margin_scale: Diminishing-returns margin scale for Colley/Massey (None = off)
+        schedule: Compiled games; when given, Colley/Massey systems are assembled
+            from its arrays so re-weighting never re-reads the game dicts
+
+    Returns:
+        Dictionary mapping team names to ratings
+    """
+    if schedule is not None and method in ("colley", "massey", "hybrid"):
+        def solve(kind):
+            return sweep_recency(schedule, [recency_decay], kind, prior_strength=prior_strength,
+                                 ridge_lambda=ridge_lambda, hfa=hfa, margin_scale=margin_scale)[0]
+        if method == "hybrid":
+            r = colley_weight * zscore(solve("colley")) + (1.0 - colley_weight) * zscore(solve("massey"))
+        else:
+            r = solve(method)
+        return {team_list[i]: float(r[i]) for i in range(len(team_list))}
+    if method == "colley":
+        C, b = build_colley(team_list, games, prior_strength=prior_strength,
+                            recency_decay=recency_decay, margin_scale=margin_scale)
+        r = solve_colley(C, b)
+        return {team_list[i]: float(r[i]) for i in range(len(team_list))}
+    if method == "massey":
+        M, mb = build_massey(team_list, games, ridge_lambda=ridge_lambda, hfa=hfa,
+                             recency_decay=recency_decay, margin_scale=margin_scale)
+        r = solve_massey(M, mb)
+        return {team_list[i]: float(r[i]) for i in range(len(team_list))}
+    if method == "elo":
+        return run_elo(team_list, games, init=elo_init, k=elo_k, regress_to_mean=elo_regress, hfa=hfa)
+    if method == "hybrid":
+        return hybrid_rating(team_list, games,
+                             colley_weight=colley_weight, massey_weight=1.0 - colley_weight,
+                             prior_strength=prior_strength, ridge_lambda=ridge_lambda, hfa=hfa,
+                             recency_decay=recency_decay, margin_scale=margin_scale)
+    raise ValueError(f"Unknown rating method: {method}")
@@ -0,0 +1,184 @@
+import glob
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List
+from .config import settings
+from .analytics import records, strength_of_schedule, momentum, ppoints_fast
+from .ingest import GAME_FIELDS
+from .ratings import compute_ratings
+from . import profiling
+
+RESULTS_VERSION = 2  # bump when model or analytics output changes so cached results recompute
+
+def _digest(obj: Any) -> str:
+    obj = {**obj, "version": RESULTS_VERSION}
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+def games_fingerprint(games: List[Any]) -> str:
+    """Hash of the game fields the models read; works for raw dicts and GameRecords alike."""
+    h = hashlib.sha256()
+    for g in games:
+        h.update(json.dumps([g.get(f) for f in GAME_FIELDS], separators=(",", ":")).encode())
+    return h.hexdigest()
+
+def snapshots_fingerprint(year: int, method: str) -> List[List[Any]]:
+    """(file, mtime, size) of a season's weekly snapshots, so ppoints entries expire when they change."""
+    paths = sorted(glob.glob(os.path.join(settings.cache_dir, f"ratings_{year}_{method}_week*.json")))
+    return [[os.path.basename(p), os.path.getmtime(p), os.path.getsize(p)] for p in paths]
+
+class ResultsCache:
+    """
+    Two-tier cache of computed results: an in-process LRU in front of a size-capped disk store.
+
+    Values must be JSON-serializable. Disk entries are evicted oldest-access
+    first once the store exceeds max_bytes; a disk hit refreshes the entry's
+    access time and promotes it into memory.
+    """
+
+    def __init__(self, disk_dir: str | None = None, max_entries: int = 64,
+                 max_bytes: int = settings.results_cache_mb * 1024 * 1024):
+        self.disk_dir = disk_dir or os.path.join(settings.cache_dir, "results")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                profiling.count("results.hits.memory")
+                return self._memory[key]
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            profiling.count("results.misses")
+            return None
+        profiling.count("results.hits.disk")
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        self._remember(key, value)
+        if self.max_bytes <= 0:
+            return
+        os.makedirs(self.disk_dir, exist_ok=True)
+        tmp = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f, separators=(",", ":"))
+        os.replace(tmp, self._path(key))
+        self._evict()
+
+    def _remember(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        entries = []
+        for path in glob.glob(os.path.join(self.disk_dir, "*.json")):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                profiling.count("results.evictions")
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        for path in glob.glob(os.path.join(self.disk_dir, "*.json")):
+            os.remove(path)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+results_cache = ResultsCache()
+
+def cached_ratings(method: str, team_list: List[str], games: List[Any], games_hash: str | None = None,
+                   cache: ResultsCache | None = None, **params) -> Dict[str, float]:
+    """
+    compute_ratings behind the results cache.
+
+    The key covers the games, the team list, the method and every rating
+    parameter (including each one's default), so any change recomputes.
+    """
+    cache = cache or results_cache
+    schedule = params.pop("schedule", None)
+    key = _digest({
+        "kind": "ratings",
+        "games": games_hash or games_fingerprint(games),
+        "teams": team_list,
+        "method": method,
+        "params": {**_rating_defaults(), **params},
+    })
+    return dict(cache.get_or_compute(key, lambda: compute_ratings(method, team_list, games, schedule=schedule, **params)))
+
+def _rating_defaults() -> Dict[str, Any]:
+    return {
+        "hfa": settings.home_field_adv, "prior_strength": settings.colley_prior_strength,
+        "ridge_lambda": settings.massey_ridge_lambda, "elo_k": settings.elo_k,
+        "elo_regress": settings.elo_regress_to_mean, "elo_init": settings.elo_init,
+        "colley_weight": 0.5, "recency_decay": settings.recency_decay, "margin_scale": settings.margin_scale,
+    }
+
+def cached_analytics(team_list: List[str], games: List[Any], ratings: Dict[str, float],
+                     conference_map: Dict[str, str], year: int, snapshot_method: str = "hybrid",
+                     games_hash: str | None = None, cache: ResultsCache | None = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Records, SOS, momentum and ppoints behind the results cache.
+
+    Keyed by the games, the ratings, the conference map and the weekly
+    snapshots ppoints reads, so new games, new ratings or rebuilt snapshots
+    all miss.
+
+    Returns:
+        {"records": ..., "sos": ..., "momentum": ..., "ppoints": ...} keyed by team;
+        fresh dicts, so callers may modify them without touching the cached entry
+    """
+    cache = cache or results_cache
+    key = _digest({
+        "kind": "analytics",
+        "games": games_hash or games_fingerprint(games),
+        "teams": team_list,
+        "ratings": ratings,
+        "conferences": conference_map,
+        "year": year,
+        "snapshots": snapshots_fingerprint(year, snapshot_method),
+    })
+
+    def compute():
+        return {
+            "records": records(team_list, games),
+            "sos": strength_of_schedule(team_list, games, ratings),
+            "momentum": momentum(team_list, games, ratings),
+            "ppoints": ppoints_fast(team_list, games, ratings, conference_map, method=snapshot_method, year=year),
+        }
+
+    out = cache.get_or_compute(key, compute)
+    return {"records": {t: tuple(r) for t, r in out["records"].items()},
+            "sos": dict(out["sos"]), "momentum": dict(out["momentum"]), "ppoints": dict(out["ppoints"])}
@@ -0,0 +1,201 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+import numpy as np
+from .history import UNRANKED, RankHistory
+from .schedule import Schedule, compile_schedule, rank_vector
+
+@dataclass
+class GameGraph:
+    """
+    Per-team adjacency of a season's scored games, joined with game-time ranks.
+
+    Every game appears twice, once from each side, in CSR layout: team k's
+    games are entries offsets[k]:offsets[k+1] of the edge arrays, in
+    chronological week order (postseason after the regular season). Margins
+    are from the owning team's perspective. Opponent ranks are taken from the
+    weekly snapshot of the game's week (the same lookup ppoints uses), or the
+    latest snapshot for postseason games, falling back to the current rank
+    when no snapshot exists.
+    """
+    teams: List[str]
+    offsets: np.ndarray         # (T+1,)
+    owner: np.ndarray           # (E,) team index
+    opponent: np.ndarray        # (E,) team index
+    margin: np.ndarray          # (E,) points for - points against
+    week: np.ndarray            # (E,) chronological week
+    postseason: np.ndarray      # (E,)
+    home: np.ndarray            # (E,) True if the owner was the home team
+    opp_rank: np.ndarray        # (E,) opponent's rank at game time
+    current_rank: np.ndarray    # (T,)
+    team_index: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.team_index = {t: i for i, t in enumerate(self.teams)}
+
+    @property
+    def won(self) -> np.ndarray:
+        return self.margin > 0
+
+    @property
+    def lost(self) -> np.ndarray:
+        return self.margin < 0
+
+    def _count(self, mask: np.ndarray) -> np.ndarray:
+        return np.bincount(self.owner[mask], minlength=len(self.teams))
+
+    def quality_wins(self, top: int = 25) -> np.ndarray:
+        """Wins over opponents ranked `top` or better at game time, per team."""
+        return self._count(self.won & (self.opp_rank <= top))
+
+    def bad_losses(self, outside: int = 50) -> np.ndarray:
+        """Losses to opponents ranked worse than `outside` at game time, per team."""
+        return self._count(self.lost & (self.opp_rank > outside))
+
+    def record_by_tier(self, bounds: Tuple[int, ...] = (10, 25, 50)) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Wins and losses against each game-time rank tier.
+
+        Tiers are 1..bounds[0], bounds[0]+1..bounds[1], ..., and everyone else.
+
+        Returns:
+            Tuple of (wins, losses), each teams×tiers
+        """
+        tier = np.searchsorted(np.asarray(bounds), self.opp_rank)
+        n_tiers = len(bounds) + 1
+        cell = self.owner * n_tiers + tier
+        size = len(self.teams) * n_tiers
+        wins = np.bincount(cell[self.won], minlength=size).reshape(-1, n_tiers)
+        losses = np.bincount(cell[self.lost], minlength=size).reshape(-1, n_tiers)
+        return wins, losses
+
+    def games_of(self, team: str) -> List[Dict[str, Any]]:
+        """One team's games in chronological order, with the opponent's game-time rank."""
+        k = self.team_index[team]
+        sl = slice(self.offsets[k], self.offsets[k + 1])
+        return [{"week": int(w), "postseason": bool(p), "opponent": self.teams[o], "home": bool(h),
+                 "margin": float(m), "opp_rank": None if r == UNRANKED else int(r)}
+                for w, p, o, h, m, r in zip(self.week[sl], self.postseason[sl], self.opponent[sl],
+                                            self.home[sl], self.margin[sl], self.opp_rank[sl])]
+
+    def _margin_matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        # Mean margin of each team against each opponent (0 where they never met) and a played mask
+        T = len(self.teams)
+        cell = self.owner * T + self.opponent
+        met = np.bincount(cell, minlength=T * T).reshape(T, T)
+        total = np.bincount(cell, weights=self.margin, minlength=T * T).reshape(T, T)
+        played = met > 0
+        return np.divide(total, met, out=np.zeros((T, T)), where=played), played.astype(float)
+
+    def common_opponent_margins(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        For every pair (a, b): mean over their common opponents c of
+        margin(a vs c) - margin(b vs c), and how many common opponents there are.
+
+        Returns:
+            Tuple of (teams×teams mean margin difference, NaN without common opponents;
+            teams×teams common-opponent counts)
+        """
+        mean, played = self._margin_matrix()
+        counts = played @ played.T
+        diff = (mean * played) @ played.T - played @ (mean * played).T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, diff / counts, np.nan), counts.astype(np.int64)
+
+    def common_opponents(self, a: str, b: str) -> List[Tuple[str, float, float]]:
+        """(opponent, a's mean margin, b's mean margin) for each opponent both teams played."""
+        mean, played = self._margin_matrix()
+        i, j = self.team_index[a], self.team_index[b]
+        both = np.flatnonzero((played[i] > 0) & (played[j] > 0))
+        return [(self.teams[c], float(mean[i, c]), float(mean[j, c])) for c in both]
+
+    def beat_matrix(self) -> np.ndarray:
+        """teams×teams boolean: row team beat column team at least once."""
+        T = len(self.teams)
+        beat = np.zeros((T, T), dtype=bool)
+        beat[self.owner[self.won], self.opponent[self.won]] = True
+        return beat
+
+    def chain_lengths(self, max_len: int = 3) -> np.ndarray:
+        """
+        Length of the shortest transitive win chain from every team to every other
+        (a beat x beat ... beat b), up to max_len games; 0 where there is none.
+        """
+        beat = self.beat_matrix()
+        B = beat.astype(np.int64)
+        out = np.where(beat, 1, 0)
+        reach = beat
+        for step in range(2, max_len + 1):
+            reach = (reach.astype(np.int64) @ B) > 0
+            out = np.where((out == 0) & reach, step, out)
+        np.fill_diagonal(out, 0)
+        return out
+
+    def win_chain(self, a: str, b: str, max_len: int = 4) -> List[str] | None:
+        """A shortest chain of wins leading from a to b (a, x, ..., b), or None."""
+        src, dst = self.team_index[a], self.team_index[b]
+        prev = {src: None}
+        frontier = deque([(src, 0)])
+        while frontier:
+            k, depth = frontier.popleft()
+            if k == dst:
+                path = []
+                while k is not None:
+                    path.append(self.teams[k])
+                    k = prev[k]
+                return path[::-1]
+            if depth == max_len:
+                continue
+            sl = slice(self.offsets[k], self.offsets[k + 1])
+            for o in self.opponent[sl][self.won[sl]]:
+                if o not in prev:
+                    prev[o] = k
+                    frontier.append((o, depth + 1))
+        return None
+
+def build_game_graph(team_list: List[str], games: List[Any], ratings: Dict[str, float],
+                     history: RankHistory | None = None, schedule: Schedule | None = None) -> GameGraph:
+    """
+    Index a season's games for résumé queries.
+
+    Args:
+        team_list: List of team names; defines the team index
+        games: List of game dictionaries (or GameRecords)
+        ratings: Current ratings, for current ranks and weeks without a snapshot
+        history: Weekly rank history supplying game-time ranks (None = current ranks only)
+        schedule: Compiled games, if already at hand
+    """
+    sched = schedule if schedule is not None else compile_schedule(team_list, games)
+    T, G = sched.n_teams, sched.n_games
+    team_to_idx = {t: i for i, t in enumerate(sched.teams)}
+
+    # Current ranks over the full ratings dict (teams outside team_list still take a slot)
+    current_rank = np.full(T, UNRANKED, dtype=np.int64)
+    for team, rank in zip(ratings, rank_vector(list(ratings.values()))):
+        if team in team_to_idx:
+            current_rank[team_to_idx[team]] = rank
+
+    owner = np.concatenate([sched.home, sched.away])
+    opponent = np.concatenate([sched.away, sched.home])
+    margin = np.concatenate([sched.margin, -sched.margin])
+    week = np.concatenate([sched.chrono_week, sched.chrono_week])
+    post = np.concatenate([sched.postseason, sched.postseason])
+    home = np.concatenate([np.ones(G, dtype=bool), np.zeros(G, dtype=bool)])
+
+    opp_rank = current_rank[opponent]
+    if history is not None and len(history.weeks):
+        # Snapshots are keyed by CFBD week, which restarts at 1 in the postseason:
+        # postseason games take the latest snapshot instead of a same-numbered regular week
+        snap_week = np.concatenate([sched.week, sched.week])
+        snap_week = np.where(post, history.weeks[-1], snap_week)
+        col = np.array([history.team_index.get(t, -1) for t in sched.teams], dtype=np.intp)
+        snap = np.isin(snap_week, history.weeks)
+        at = history.rank_at(np.maximum(col[opponent], 0), snap_week)
+        at = np.where(col[opponent] >= 0, at, UNRANKED)
+        opp_rank = np.where(snap, at, opp_rank)
+
+    order = np.lexsort((np.arange(2 * G), week, owner))
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(owner, minlength=T))])
+    return GameGraph(teams=list(sched.teams), offsets=offsets, owner=owner[order], opponent=opponent[order],
+                     margin=margin[order], week=week[order], postseason=post[order], home=home[order],
+                     opp_rank=opp_rank[order], current_rank=current_rank)
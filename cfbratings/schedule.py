@@ -0,0 +1,128 @@
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, List
+
+@dataclass(frozen=True)
+class Schedule:
+    """
+    Completed games between teams in team_list, compiled to parallel arrays.
+
+    Only games the models actually score are kept: completed, both point totals
+    present and both teams in team_list. Games stay in their original order.
+    A missing week is stored as -1 and a missing/empty conference as -1.
+    chrono_week orders games in time across season types (see chronological_week).
+    """
+    teams: List[str]
+    conferences: List[str]
+    home: np.ndarray          # team index
+    away: np.ndarray          # team index
+    home_points: np.ndarray
+    away_points: np.ndarray
+    week: np.ndarray
+    season: np.ndarray
+    game_id: np.ndarray
+    home_conf: np.ndarray     # index into conferences
+    away_conf: np.ndarray
+    chrono_week: np.ndarray   # week with postseason weeks placed after the regular season
+    postseason: np.ndarray    # True for postseason games
+
+    @property
+    def n_teams(self) -> int:
+        return len(self.teams)
+
+    @property
+    def n_games(self) -> int:
+        return len(self.home)
+
+    @property
+    def margin(self) -> np.ndarray:
+        """Home points minus away points"""
+        return self.home_points - self.away_points
+
+    @property
+    def nonconference(self) -> np.ndarray:
+        """True where both conferences are known and differ"""
+        return (self.home_conf >= 0) & (self.away_conf >= 0) & (self.home_conf != self.away_conf)
+
+def last_regular_week(games: List[dict]) -> int:
+    """Latest week number among regular-season (non-postseason) games."""
+    return max(((g.get("week", 0) or 0) for g in games if g.get("seasonType") != "postseason"), default=0)
+
+def chronological_week(game: dict, last_regular: int) -> int:
+    """
+    Week number in season order.
+
+    CFBD restarts postseason weeks at 1, so bowl and playoff games are shifted
+    past the last regular-season week; regular-season weeks are unchanged.
+    """
+    week = game.get("week", 0) or 0
+    return week + last_regular if game.get("seasonType") == "postseason" else week
+
+def compile_schedule(team_list: List[str], games: List[dict]) -> Schedule:
+    """
+    Compile raw game dictionaries into a Schedule.
+
+    Args:
+        team_list: List of team names; defines the team index
+        games: List of game dictionaries
+
+    Returns:
+        Schedule with one entry per scoreable game
+    """
+    team_to_idx = {t: i for i, t in enumerate(team_list)}
+    conf_index: Dict[str, int] = {}
+    home, away, hpts, apts, week, season, gid, hconf, aconf, chrono, post = ([] for _ in range(11))
+    last_regular = last_regular_week(games)
+
+    def conf_code(name):
+        if not name:
+            return -1
+        return conf_index.setdefault(name, len(conf_index))
+
+    for g in games:
+        if not g.get("completed", False):
+            continue
+        hp = g.get("homePoints"); ap = g.get("awayPoints")
+        if hp is None or ap is None:
+            continue
+        h = team_to_idx.get(g["homeTeam"]); a = team_to_idx.get(g["awayTeam"])
+        if h is None or a is None:
+            continue
+        w = g.get("week", 0)
+        home.append(h); away.append(a)
+        hpts.append(hp); apts.append(ap)
+        week.append(-1 if w is None else w)
+        season.append(g.get("season", 0) or 0)
+        gid.append(g.get("id", 0) or 0)
+        hconf.append(conf_code(g.get("homeConference")))
+        aconf.append(conf_code(g.get("awayConference")))
+        chrono.append(chronological_week(g, last_regular))
+        post.append(g.get("seasonType") == "postseason")
+
+    return Schedule(
+        teams=list(team_list),
+        conferences=list(conf_index),
+        home=np.array(home, dtype=np.intp),
+        away=np.array(away, dtype=np.intp),
+        home_points=np.array(hpts, dtype=float),
+        away_points=np.array(apts, dtype=float),
+        week=np.array(week, dtype=np.int64),
+        season=np.array(season, dtype=np.int64),
+        game_id=np.array(gid, dtype=np.int64),
+        home_conf=np.array(hconf, dtype=np.intp),
+        away_conf=np.array(aconf, dtype=np.intp),
+        chrono_week=np.array(chrono, dtype=np.int64),
+        postseason=np.array(post, dtype=bool),
+    )
+
+def rank_vector(values: np.ndarray) -> np.ndarray:
+    """
+    1-based ranks, highest value first.
+
+    Ties keep their input order, matching sorted(..., reverse=True) on a dict's items.
+    """
+    values = np.asarray(values, dtype=float)
+    order = np.argsort(-values, kind="stable")
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[order] = np.arange(1, len(values) + 1)
+    return ranks
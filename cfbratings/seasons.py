@@ -0,0 +1,139 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List
+from .config import Settings, settings
+from . import io
+from .io import fetch_teams, fetch_games_slim, ensure_snapshots
+from .ratings import compute_ratings
+from .analytics import records, strength_of_schedule, momentum, ppoints_fast, compute_conference_strength_robust
+
+def _init_worker(cfg: Settings) -> None:
+    # Pools with max_tasks_per_child spawn their workers, which re-import the package;
+    # carry over the parent's settings (cache dir, API key) instead of re-reading the environment
+    io.settings = cfg
+
+def seasons_dir() -> str:
+    """Default output directory for season rebuilds: <cache_dir>/seasons."""
+    return os.path.join(settings.cache_dir, "seasons")
+
+def season_output_path(out_dir: str, year: int, method: str) -> str:
+    return os.path.join(out_dir, f"season_{year}_{method}.json")
+
+def run_season(year: int, method: str = "hybrid", season_type: str = "both",
+               out_dir: str | None = None, refresh: bool = False) -> Dict[str, Any]:
+    """
+    Compute ratings, analytics and weekly snapshots for one season and write them to out_dir.
+
+    Runs in a pool worker, so only a small summary is returned to the parent;
+    the season's games and ratings are released when the worker exits.
+    out_dir defaults to seasons_dir().
+
+    Returns:
+        Summary dict (year, output path, sizes, timing, worker pid, top teams)
+    """
+    out_dir = out_dir or seasons_dir()
+    t0 = time.perf_counter()
+    teams = fetch_teams(year, force_refresh=refresh)
+    games = fetch_games_slim(year, season_type=season_type, force_refresh=refresh)
+    t_fetch = time.perf_counter()
+
+    # PPoints reads the hybrid weekly snapshots whatever method the season is rated with
+    ensure_snapshots(year, method="hybrid")
+    t_snap = time.perf_counter()
+
+    team_list = [t["school"] for t in teams]
+    conference_map = {t["school"]: t.get("conference") for t in teams}
+    ratings = compute_ratings(method, team_list, games)
+    recs = records(team_list, games)
+    sos = strength_of_schedule(team_list, games, ratings)
+    mom = momentum(team_list, games, ratings)
+    pp = ppoints_fast(team_list, games, ratings, conference_map, method="hybrid", year=year)
+    conf_strength = compute_conference_strength_robust(ratings, conference_map)
+    t_rate = time.perf_counter()
+
+    completed_games = [g for g in games if g.get("completed", False)]
+    latest_week = max((g.get("week", 0) for g in completed_games), default=0)
+
+    os.makedirs(out_dir, exist_ok=True)
+    path = season_output_path(out_dir, year, method)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "year": year,
+            "method": method,
+            "season_type": season_type,
+            "latest_week": latest_week,
+            "conference_strength": conf_strength,
+            "teams": {
+                t: {"rating": ratings[t], "record": list(recs[t]), "sos": sos[t],
+                    "momentum": mom[t], "ppoints": pp[t]}
+                for t in team_list
+            },
+        }, f, indent=2)
+
+    top = sorted(ratings.items(), key=lambda kv: kv[1], reverse=True)[:5]
+    return {
+        "year": year,
+        "path": path,
+        "teams": len(team_list),
+        "games": len(completed_games),
+        "latest_week": latest_week,
+        "top": [t for t, _ in top],
+        "pid": os.getpid(),
+        "timing": {
+            "fetch": t_fetch - t0,
+            "snapshots": t_snap - t_fetch,
+            "ratings": t_rate - t_snap,
+            "total": time.perf_counter() - t0,
+        },
+    }
+
+def run_seasons(years: List[int], method: str = "hybrid", season_type: str = "both",
+                out_dir: str | None = None, workers: int | None = None,
+                refresh: bool = False) -> Dict[str, Any]:
+    """
+    Fan seasons out across a process pool and write a merged index.
+
+    Each worker handles one season and is then replaced, which bounds memory to
+    a single season per process. Failed seasons are recorded in the index
+    rather than aborting the run. out_dir defaults to seasons_dir().
+
+    Returns:
+        The merged index, also written to out_dir/index_<method>.json
+    """
+    out_dir = out_dir or seasons_dir()
+    t0 = time.perf_counter()
+    seasons: Dict[int, Dict[str, Any]] = {}
+    errors: Dict[int, str] = {}
+    with ProcessPoolExecutor(max_workers=workers, max_tasks_per_child=1,
+                             initializer=_init_worker, initargs=(io.settings,)) as pool:
+        futures = {
+            pool.submit(run_season, year, method, season_type, out_dir, refresh): year
+            for year in years
+        }
+        for done, fut in enumerate(as_completed(futures), start=1):
+            year = futures[fut]
+            try:
+                summary = fut.result()
+            except Exception as e:
+                errors[year] = repr(e)
+                print(f"[{done}/{len(years)}] {year} failed: {e!r}")
+                continue
+            seasons[year] = summary
+            timing = summary["timing"]
+            print(f"[{done}/{len(years)}] {year} done in {timing['total']:.1f}s "
+                  f"(pid {summary['pid']}, fetch {timing['fetch']:.1f}s, "
+                  f"snapshots {timing['snapshots']:.1f}s, ratings {timing['ratings']:.1f}s)")
+
+    index = {
+        "method": method,
+        "season_type": season_type,
+        "elapsed": time.perf_counter() - t0,
+        "seasons": [seasons[y] for y in sorted(seasons)],
+        "errors": {str(y): errors[y] for y in sorted(errors)},
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, f"index_{method}.json"), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+    return index
@@ -1,11 +1,10 @@
-from cfbratings.io import fetch_teams, fetch_games, save_weekly_ratings
+from cfbratings.io import fetch_teams, fetch_games_slim, save_weekly_ratings
 from cfbratings.models.hybrid import hybrid_rating
 from cfbratings.config import settings
 
 def snapshot_season(year: int, method: str = "hybrid"):
     teams = fetch_teams(year)
-    games_payload = fetch_games(year, season_type="both")
-    games = games_payload["data"]
+    games = fetch_games_slim(year, season_type="both")
 
     team_list = [t["school"] for t in teams]
     completed_games = [g for g in games if g.get("completed", False)]
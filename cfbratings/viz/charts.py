@@ -1,18 +1,24 @@
+import hashlib
+import json
+import os
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from typing import Any, Dict, List, Tuple
 
-def plot_top_n(ratings: Dict[str, float], records: Dict[str, Tuple[int, int]], n: int = 25, title: str = ""):
+CHART_VERSION = 1  # bump when drawing code changes so cached charts re-render
+
+def _draw_top_n(ax, ratings: Dict[str, float], records: Dict[str, Tuple[int, int]], n: int, title: str):
     sorted_items = sorted(ratings.items(), key=lambda kv: kv[1], reverse=True)[:n]
     teams = [t for t, _ in sorted_items]
     values = [v for _, v in sorted_items]
     recs = [f"{records[t][0]}-{records[t][1]}" for t in teams]
-    ypos = np.arange(n)
-    plt.figure(figsize=(12, 10))
-    plt.barh(ypos[::-1], values[::-1], color="#0A3161", height=0.8)
-    plt.yticks(ypos[::-1], [f"{i+1}. {team} ({rec})" for i, (team, rec) in enumerate(zip(teams[::-1], recs[::-1]))])
-    plt.xlabel("Rating")
-    plt.title(title or "Top Teams")
+    ypos = np.arange(len(teams))
+    ax.barh(ypos[::-1], values[::-1], color="#0A3161", height=0.8)
+    ax.set_yticks(ypos[::-1], [f"{i+1}. {team} ({rec})" for i, (team, rec) in enumerate(zip(teams[::-1], recs[::-1]))])
+    ax.set_xlabel("Rating")
+    ax.set_title(title or "Top Teams")
     # Scale x-limits based on data spread
     value_range = max(values) - min(values)
     if value_range > 1e-8:
@@ -23,9 +29,99 @@ def plot_top_n(ratings: Dict[str, float], records: Dict[str, Tuple[int, int]], n
         avg_value = (max(values) + min(values)) / 2
         xmin = avg_value - 0.1
         xmax = avg_value + 0.1
-    plt.xlim(xmin, xmax)
-    plt.grid(axis="x", alpha=0.3)
+    ax.set_xlim(xmin, xmax)
+    ax.grid(axis="x", alpha=0.3)
     for i, rating in enumerate(values[::-1]):
-        plt.text(rating + 0.01, i, f"{rating:.4f}", va="center", fontsize=9, fontweight="bold")
+        ax.text(rating + 0.01, i, f"{rating:.4f}", va="center", fontsize=9, fontweight="bold")
+
+def top_n_figure(ratings: Dict[str, float], records: Dict[str, Tuple[int, int]], n: int = 25, title: str = "") -> Figure:
+    """Top-n bar chart as a standalone Agg Figure (no pyplot state, safe in workers and servers)."""
+    fig = Figure(figsize=(12, 10))
+    FigureCanvasAgg(fig)
+    _draw_top_n(fig.add_subplot(), ratings, records, n, title)
+    fig.tight_layout()
+    return fig
+
+def plot_top_n(ratings: Dict[str, float], records: Dict[str, Tuple[int, int]], n: int = 25, title: str = ""):
+    import matplotlib.pyplot as plt
+    plt.figure(figsize=(12, 10))
+    _draw_top_n(plt.gca(), ratings, records, n, title)
     plt.tight_layout()
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+def _slim_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    # Only the teams that are drawn matter, both for the hash and for what is shipped to workers
+    n = job.get("n", 25)
+    top = sorted(job["ratings"].items(), key=lambda kv: kv[1], reverse=True)[:n]
+    return {**job, "ratings": dict(top), "records": {t: tuple(job["records"][t]) for t, _ in top}}
+
+def chart_hash(job: Dict[str, Any], fmt: str) -> str:
+    """Content hash of a chart's inputs; unchanged inputs mean the file can be reused."""
+    key = {k: job.get(k) for k in ("ratings", "records", "n", "title", "dpi")}
+    key["ratings"] = list(key["ratings"].items())  # order matters for ties
+    key.update(format=fmt, version=CHART_VERSION)
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+def _render_job(args) -> List[str]:
+    job, out_dir, formats = args
+    fig = top_n_figure(job["ratings"], job["records"], n=job.get("n", 25), title=job.get("title", ""))
+    paths = []
+    for fmt in formats:
+        path = os.path.join(out_dir, f"{job['name']}.{fmt}")
+        fig.savefig(path, format=fmt, dpi=job.get("dpi", 100))
+        paths.append(path)
+    return paths
+
+def render_charts(jobs: List[Dict[str, Any]], out_dir: str, formats: Tuple[str, ...] = ("png",),
+                  workers: int | None = None, use_cache: bool = True) -> Dict[str, Any]:
+    """
+    Render many top-n charts headlessly, in parallel worker processes.
+
+    Each job is a dict with "name" (output file stem), "ratings", "records" and
+    optionally "n", "title" and "dpi". A manifest of content hashes in out_dir
+    lets unchanged charts be skipped on the next run. Jobs with no ratings
+    have nothing to draw and are left out.
+
+    Returns:
+        {"rendered": [paths], "skipped": [paths], "empty": [job names]}
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, ".charts_manifest.json")
+    manifest: Dict[str, str] = {}
+    if use_cache and os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    todo, skipped, empty, hashes = [], [], [], {}
+    for job in jobs:
+        if not job.get("ratings"):
+            empty.append(job["name"])
+            continue
+        job = _slim_job(job)
+        stale = []
+        for fmt in formats:
+            fname = f"{job['name']}.{fmt}"
+            h = chart_hash(job, fmt)
+            hashes[fname] = h
+            if use_cache and manifest.get(fname) == h and os.path.exists(os.path.join(out_dir, fname)):
+                skipped.append(os.path.join(out_dir, fname))
+            else:
+                stale.append(fmt)
+        if stale:
+            todo.append((job, out_dir, tuple(stale)))
+
+    rendered: List[str] = []
+    workers = workers or os.cpu_count() or 1
+    if len(todo) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunksize = max(1, len(todo) // (4 * workers))
+            for paths in pool.map(_render_job, todo, chunksize=chunksize):
+                rendered.extend(paths)
+    else:
+        for item in todo:
+            rendered.extend(_render_job(item))
+
+    manifest.update(hashes)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return {"rendered": rendered, "skipped": skipped, "empty": empty}
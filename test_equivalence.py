@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Differential tests: every optimized engine against the reference implementation
+it replaces, on randomized schedules, with timings reported side by side.
+"""
+
+import dataclasses
+import os
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+import numpy as np
+from cfbratings import history, io, results_cache
+from cfbratings.analytics import (compute_conference_strength_robust, conference_strength_vector,
+                                  encode_conferences, ppoints, ppoints_fast, records,
+                                  strength_of_schedule, momentum)
+from cfbratings.history import load_rank_history
+from cfbratings.jobs import SnapshotJobs
+from cfbratings.live import IncrementalRatings
+from cfbratings.models.colley import build_colley, solve_colley
+from cfbratings.models.massey import build_massey, solve_massey
+from cfbratings.models.elo import run_elo
+from cfbratings.models.hybrid import hybrid_rating
+from cfbratings.models.weighted import sweep_recency
+from cfbratings.ratings import compute_ratings
+from cfbratings.results_cache import ResultsCache, cached_analytics
+from cfbratings.schedule import compile_schedule, rank_vector
+
+SEEDS = [7, 11, 23]
+TOL = 1e-9
+
+def random_season(seed, n_teams=40, n_weeks=8, games_per_week=14, pools=2, isolated=2):
+    """
+    Randomized season exercising the awkward cases: ties, completed games with
+    missing points, unfinished games, non-FBS opponents, a schedule split into
+    disconnected pools plus teams that never play, teams playing twice in a
+    week and postseason games reusing regular-season week numbers.
+
+    Returns:
+        Tuple of (team_list, conference_map, games)
+    """
+    rng = random.Random(seed)
+    teams = [f"Team {k:02d}" for k in range(n_teams)]
+    conference_map = {t: f"Conf {k % 5}" for k, t in enumerate(teams)}
+    playing = teams[:n_teams - isolated]
+    groups = [playing[k::pools] for k in range(pools)]
+
+    games = []
+    def add(week, home, away, season_type="regular"):
+        hp, ap = rng.randint(0, 56), rng.randint(0, 56)
+        roll = rng.random()
+        if roll < 0.06:
+            ap = hp  # tie
+        g = {
+            "id": 1000 + len(games), "season": 2024, "week": week, "seasonType": season_type,
+            "completed": roll > 0.04, "homeTeam": home, "awayTeam": away,
+            "homePoints": None if 0.04 < roll < 0.08 else hp, "awayPoints": ap,
+            "homeConference": conference_map.get(home, "FCS"),
+            "awayConference": conference_map.get(away, None if roll > 0.95 else "FCS"),
+            "neutralSite": roll > 0.9,
+        }
+        games.append(g)
+
+    for week in range(1, n_weeks + 1):
+        for _ in range(games_per_week):
+            group = rng.choice(groups)
+            home, away = rng.sample(group, 2)
+            if rng.random() < 0.1:
+                away = f"FCS {rng.randint(0, 9)}"
+                if rng.random() < 0.5:
+                    home, away = away, home
+            add(week, home, away)
+    for week in (1, 2):  # postseason restarts its week numbering
+        for group in groups:
+            home, away = rng.sample(group, 2)
+            add(week, home, away, "postseason")
+    rng.shuffle(games)
+    return teams, conference_map, games
+
+def _best(fn, repeat=3):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+def _report(name, ref_s, fast_s):
+    print(f"  {name:<32} reference {ref_s * 1e3:8.2f} ms   optimized {fast_s * 1e3:8.2f} ms   "
+          f"{ref_s / max(fast_s, 1e-12):6.1f}x")
+
+def _assert_close(ref, fast, what):
+    if isinstance(ref, dict):
+        assert ref.keys() == set(fast.keys()), f"{what}: team sets differ"
+        ref, fast = [ref[t] for t in ref], [fast[t] for t in ref]
+    ref, fast = np.asarray(ref, dtype=float), np.asarray(fast, dtype=float)
+    assert np.allclose(ref, fast, rtol=TOL, atol=TOL), f"{what}: max diff {np.max(np.abs(ref - fast))}"
+
+@contextmanager
+def temp_cache():
+    """Point every module that reads settings.cache_dir at a throwaway directory."""
+    modules = (io, history, results_cache)
+    saved = [m.settings for m in modules]
+    with tempfile.TemporaryDirectory() as tmp:
+        for m in modules:
+            m.settings = dataclasses.replace(m.settings, cache_dir=tmp)
+        try:
+            yield tmp
+        finally:
+            for m, s in zip(modules, saved):
+                m.settings = s
+
+def test_colley_massey_sweep():
+    """Weighted builders + solvers vs the batched array sweep"""
+    print("\nColley/Massey builders vs batched sweep...")
+    decays = [0.0, 0.1, 0.3]
+    for seed in SEEDS:
+        teams, _, games = random_season(seed)
+        for scale in (None, 14.0):
+            def reference():
+                out = {}
+                for d in decays:
+                    C, b = build_colley(teams, games, recency_decay=d, margin_scale=scale)
+                    M, mb = build_massey(teams, games, recency_decay=d, margin_scale=scale)
+                    out[d] = (solve_colley(C, b), solve_massey(M, mb))
+                return out
+            def optimized():
+                sched = compile_schedule(teams, games)
+                return (sweep_recency(sched, decays, "colley", margin_scale=scale),
+                        sweep_recency(sched, decays, "massey", margin_scale=scale))
+            ref, ref_s = _best(reference)
+            (colley, massey), fast_s = _best(optimized)
+            for k, d in enumerate(decays):
+                _assert_close(ref[d][0], colley[k], f"colley seed={seed} decay={d} scale={scale}")
+                _assert_close(ref[d][1], massey[k], f"massey seed={seed} decay={d} scale={scale}")
+        _report(f"sweep (seed {seed})", ref_s, fast_s)
+    print("  ✓ Sweep matches builders")
+
+def test_hybrid_schedule_path():
+    """hybrid_rating vs compute_ratings over a compiled schedule"""
+    print("\nHybrid reference vs schedule path...")
+    for seed in SEEDS:
+        teams, _, games = random_season(seed)
+        for weight in (0.0, 0.35, 1.0):
+            ref, ref_s = _best(lambda: hybrid_rating(teams, games, colley_weight=weight, massey_weight=1 - weight,
+                                                     recency_decay=0.2))
+            fast, fast_s = _best(lambda: compute_ratings("hybrid", teams, games, colley_weight=weight,
+                                                         recency_decay=0.2, schedule=compile_schedule(teams, games)))
+            _assert_close(ref, fast, f"hybrid seed={seed} weight={weight}")
+        _report(f"hybrid (seed {seed})", ref_s, fast_s)
+    print("  ✓ Schedule path matches hybrid_rating")
+
+def test_incremental_ratings():
+    """Batch models vs IncrementalRatings fed in chunks, with late games out of order"""
+    print("\nBatch models vs incremental updates...")
+    for seed in SEEDS:
+        teams, _, games = random_season(seed)
+        ordered = sorted(games, key=lambda g: (g["week"], g["id"]))
+        late = ordered[len(ordered) // 3::7]  # arrive after later weeks have been processed
+        feed = [g for g in ordered if g not in late]
+
+        def optimized():
+            model = IncrementalRatings(teams)
+            for k in range(0, len(feed), 9):
+                model.add_games(feed[k:k + 9])
+            model.add_games(late)
+            return {m: model.ratings(m) for m in ("colley", "massey", "hybrid", "elo")}
+        fast, fast_s = _best(optimized)
+        ref, ref_s = _best(lambda: {m: compute_ratings(m, teams, games, recency_decay=0.0, margin_scale=None)
+                                    for m in ("colley", "massey", "hybrid", "elo")})
+        for m in ref:
+            _assert_close(ref[m], fast[m], f"{m} seed={seed}")
+        _assert_close(run_elo(teams, games), fast["elo"], f"run_elo seed={seed}")
+        _report(f"incremental (seed {seed})", ref_s, fast_s)
+    print("  ✓ Incremental models match batch models")
+
+def test_conference_strength():
+    """compute_conference_strength_robust vs the array version"""
+    print("\nConference strength reference vs arrays...")
+    teams, conference_map, games = random_season(SEEDS[0])
+    conference_map = {**conference_map, "Team 00": None, "Team 01": "Tiny"}
+    ratings = compute_ratings("hybrid", teams, games)
+    ref, ref_s = _best(lambda: compute_conference_strength_robust(ratings, conference_map))
+    codes, names = encode_conferences(list(ratings), conference_map)
+    fast, fast_s = _best(lambda: conference_strength_vector(np.array(list(ratings.values())), codes, len(names)))
+    _assert_close(ref, {c: fast[k] for k, c in enumerate(names) if c in ref}, "conference strength")
+    _report("conference strength", ref_s, fast_s)
+    print("  ✓ Conference strength matches")
+
+def test_snapshots_ppoints_history():
+    """Snapshots, ppoints, rank history and cached analytics against their references"""
+    print("\nSnapshots, ppoints and rank history...")
+    for seed in SEEDS:
+        teams, conference_map, games = random_season(seed)
+        year = 2000 + seed
+        with temp_cache() as tmp:
+            io._write_cache(io._cache_path("teams", year), [{"school": t, "conference": conference_map[t]} for t in teams])
+            io._write_cache(io._cache_path("games", year, "both"), {"_cached_at": int(time.time()), "data": games})
+
+            _, ref_s = _best(lambda: io.ensure_snapshots(year), repeat=1)
+            weeks = sorted({g["week"] for g in games if g["completed"]})
+            def optimized():
+                return {w: compute_ratings("hybrid", teams, games, recency_decay=0.0, margin_scale=None,
+                                           schedule=compile_schedule(teams, [g for g in games if g["week"] <= w]))
+                        for w in weeks}
+            fast, fast_s = _best(optimized)
+            for w in weeks:
+                _assert_close(io.load_weekly_ratings(year, w, "hybrid"), fast[w], f"snapshot seed={seed} week={w}")
+            _report(f"snapshots (seed {seed})", ref_s, fast_s)
+
+            ratings = compute_ratings("hybrid", teams, games)
+            for wc in (0.0, 0.5, 0.8):
+                ref, ref_s = _best(lambda: ppoints(teams, games, ratings, conference_map, weight_current=wc, year=year))
+                got, fast_s = _best(lambda: ppoints_fast(teams, games, ratings, conference_map, weight_current=wc, year=year))
+                _assert_close(ref, got, f"ppoints seed={seed} weight={wc}")
+            _report(f"ppoints (seed {seed})", ref_s, fast_s)
+
+            h = load_rank_history(year)
+            for k, w in enumerate(h.weeks):
+                snap = io.load_weekly_ratings(year, int(w), "hybrid")
+                order = sorted(snap.items(), key=lambda kv: kv[1], reverse=True)
+                ref_rank = {team: r + 1 for r, (team, _) in enumerate(order)}
+                assert all(h.ranks[k, h.team_index[t]] == ref_rank[t] for t in snap), f"history ranks week {w}"
+                assert list(rank_vector(list(snap.values()))) == [ref_rank[t] for t in snap]
+
+            cache = ResultsCache(disk_dir=os.path.join(tmp, "results"))
+            for attempt in ("miss", "hit"):
+                derived = cached_analytics(teams, games, ratings, conference_map, year, cache=cache)
+                assert derived["records"] == records(teams, games), f"records ({attempt})"
+                _assert_close(strength_of_schedule(teams, games, ratings), derived["sos"], f"sos ({attempt})")
+                _assert_close(momentum(teams, games, ratings), derived["momentum"], f"momentum ({attempt})")
+                _assert_close(ppoints(teams, games, ratings, conference_map, year=year), derived["ppoints"],
+                              f"cached ppoints ({attempt})")
+    print("  ✓ Snapshots, ppoints, rank history and cached analytics match")
+
+def test_background_snapshots():
+    """ensure_snapshots vs the background job runner (threads and processes)"""
+    print("\nSequential vs background snapshots...")
+    teams, conference_map, games = random_season(SEEDS[0])
+    year = 2000 + SEEDS[0]
+    with temp_cache():
+        io._write_cache(io._cache_path("teams", year), [{"school": t, "conference": conference_map[t]} for t in teams])
+        io._write_cache(io._cache_path("games", year, "both"), {"_cached_at": int(time.time()), "data": games})
+        weeks = io.snapshot_weeks(games)
+
+        def clear():
+            for w in weeks:
+                path = os.path.join(io.settings.cache_dir, f"ratings_{year}_hybrid_week{w}.json")
+                if os.path.exists(path):
+                    os.remove(path)
+
+        _, ref_s = _best(lambda: (clear(), io.ensure_snapshots(year)), repeat=1)
+        ref = {w: io.load_weekly_ratings(year, w, "hybrid") for w in weeks}
+        for processes in (False, True):
+            runner = SnapshotJobs(workers=2, processes=processes)
+            clear()
+            t0 = time.perf_counter()
+            job = runner.submit(year)
+            assert runner.submit(year) is job, "A running (year, method) job is reused"
+            assert job.wait(60) and job.status == "done", job.error
+            fast_s = time.perf_counter() - t0
+            assert sorted(job.done) == weeks and job.progress == 1.0
+            for w in weeks:
+                assert io.load_weekly_ratings(year, w, "hybrid") == ref[w], f"snapshot week {w} differs"
+            assert runner.submit(year).ready, "Nothing left to build: the job is done at once"
+            _report(f"snapshots ({'processes' if processes else 'threads'})", ref_s, fast_s)
+    print("  ✓ Background snapshots match ensure_snapshots")
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Running Equivalence Tests")
+    print("=" * 60)
+
+    try:
+        test_colley_massey_sweep()
+        test_hybrid_schedule_path()
+        test_incremental_ratings()
+        test_conference_strength()
+        test_snapshots_ppoints_history()
+        test_background_snapshots()
+
+        print("\n" + "=" * 60)
+        print("✓ All optimized paths match their references!")
+        print("=" * 60)
+    except Exception as e:
+        print(f"\n✗ Test failed with error: {e}")
+        import traceback
+        traceback.print_exc()
+        exit(1)
@@ -2,11 +2,26 @@
 """
 Simple tests to verify robustness improvements
 """
+import os
 import numpy as np
 from cfbratings.models.colley import build_colley, solve_colley
 from cfbratings.models.massey import build_massey, solve_massey
 from cfbratings.models.elo import run_elo
 from cfbratings.models.hybrid import hybrid_rating
+from cfbratings.ingest import GameRecord, project_games
+from cfbratings.live import LiveSession
+from cfbratings.ratings import compute_ratings
+from cfbratings.history import RankHistory, UNRANKED
+from cfbratings.schedule import compile_schedule
+from cfbratings.models.weighted import sweep_recency, last_scored_week, game_weights
+from cfbratings.models.components import connected_components
+from cfbratings.resume import build_game_graph
+from cfbratings.viz.charts import render_charts
+from cfbratings import profiling
+from cfbratings.results_cache import ResultsCache, cached_analytics, cached_ratings, games_fingerprint
+from cfbratings.analytics import (compute_conference_strength_robust, encode_conferences,
+                                  conference_strength_matrix, ppoints, ppoints_fast, records,
+                                  strength_of_schedule, momentum)
 
 def test_empty_team_list():
     """Test that models handle empty team lists gracefully"""
@@ -64,6 +79,14 @@ def test_no_completed_games():
     assert all(r == 1500.0 for r in ratings.values()), "Elo should return init values"
     print(f"  ✓ Elo ratings with no games: {list(ratings.values())}")
 
+    # Compiled-schedule path (what the dashboard uses), with a game not yet played
+    scheduled = [{"completed": False, "homeTeam": "Team A", "awayTeam": "Team B", "week": 1}]
+    sched = compile_schedule(teams, scheduled)
+    for method in ("colley", "massey", "hybrid"):
+        fast = compute_ratings(method, teams, scheduled, schedule=sched)
+        assert fast == compute_ratings(method, teams, scheduled), f"{method} schedule path should match with no games"
+    print("  ✓ Schedule path handles seasons with no completed games")
+
 def test_extreme_margins():
     """Test that Massey caps extreme margins"""
     print("\nTesting extreme margin capping...")
@@ -157,6 +180,474 @@ def test_max_week_empty_games():
     assert max_week == 0, "Should return 0 for no completed games"
     print(f"  ✓ Max week with no completed games: {max_week}")
 
+def test_conference_strength_arrays():
+    """Test that the array conference strength matches the dict version"""
+    print("\nTesting array conference strength...")
+
+    rng = np.random.default_rng(7)
+    teams = [f"Team {i}" for i in range(23)]
+    conference_map = {t: ["East", "West", "North", None][i % 4] for i, t in enumerate(teams) if i != 5}
+    R = rng.normal(size=(4, len(teams)))
+    R[1, :3] = 0.5  # ties
+    R[2, ::4] = np.nan  # teams missing from a week
+
+    codes, names = encode_conferences(teams, conference_map)
+    S = conference_strength_matrix(R, codes, len(names))
+    assert S.shape == (4, len(names)), "Should return weeks×conferences"
+    for w in range(R.shape[0]):
+        week = {t: R[w, k] for k, t in enumerate(teams) if not np.isnan(R[w, k])}
+        expected = compute_conference_strength_robust(week, conference_map)
+        for c, conf in enumerate(names):
+            assert S[w, c] == expected.get(conf, 1.0), f"Mismatch for {conf} in week {w}"
+    print("  ✓ Grouped sort matches per-conference medians")
+
+def test_ppoints_fast_matches_reference():
+    """Test that vectorized ppoints reproduces ppoints exactly"""
+    print("\nTesting vectorized ppoints...")
+
+    teams = ["Team A", "Team B", "Team C", "Team D"]
+    conference_map = {"Team A": "East", "Team B": "East", "Team C": "West"}
+    games = [
+        {"completed": True, "homeTeam": "Team A", "awayTeam": "Team B", "homePoints": 28, "awayPoints": 21,
+         "week": 1, "homeConference": "East", "awayConference": "East"},
+        {"completed": True, "homeTeam": "Team C", "awayTeam": "Team A", "homePoints": 10, "awayPoints": 17,
+         "week": 2, "homeConference": "West", "awayConference": "East"},
+        {"completed": True, "homeTeam": "Team D", "awayTeam": "Team C", "homePoints": 3, "awayPoints": 3,
+         "week": 2, "homeConference": None, "awayConference": "West"},
+        {"completed": True, "homeTeam": "Team B", "awayTeam": "Team D", "homePoints": 35, "awayPoints": 0,
+         "week": 3, "homeConference": "East", "awayConference": "FCS"},
+        {"completed": True, "homeTeam": "Team B", "awayTeam": "FCS Team", "homePoints": 56, "awayPoints": 7,
+         "week": 4, "homeConference": "East", "awayConference": "FCS"},
+    ]
+    ratings = hybrid_rating(teams, games)
+
+    expected = ppoints(teams, games, ratings, conference_map)
+    assert ppoints_fast(teams, games, ratings, conference_map) == expected, "Scores should match exactly"
+    print(f"  ✓ PPoints match: {expected}")
+
+    sweep = ppoints_fast(teams, games, ratings, conference_map, weight_current=[0.0, 1.0])
+    for k, wc in enumerate([0.0, 1.0]):
+        expected = ppoints(teams, games, ratings, conference_map, weight_current=wc)
+        assert list(sweep[k]) == [expected[t] for t in teams], f"Sweep mismatch at weight {wc}"
+    print("  ✓ Weight sweep matches per-weight scores")
+
+def test_projected_games_match_raw():
+    """Test that compact GameRecords rate identically to raw game dicts"""
+    print("\nTesting projected game records...")
+
+    teams = ["Team A", "Team B", "Team C"]
+    games = [
+        {"id": 1, "season": 2024, "week": 1, "completed": True, "homeTeam": "Team A", "awayTeam": "Team B",
+         "homePoints": 28, "awayPoints": 21, "venue": "Stadium", "excitementIndex": 4.2,
+         "homeLineScores": [7, 7, 7, 7], "homeConference": "East", "awayConference": "East"},
+        {"id": 2, "season": 2024, "week": 2, "completed": True, "homeTeam": "Team C", "awayTeam": "Team A",
+         "homePoints": 35, "awayPoints": 38, "homeConference": "West", "awayConference": "East"},
+        {"id": 3, "season": 2024, "week": 3, "completed": False, "homeTeam": "Team B", "awayTeam": "Team C",
+         "homePoints": None, "awayPoints": None},
+    ]
+    slim = project_games(games)
+    assert all(isinstance(g, GameRecord) for g in slim), "Should project to GameRecords"
+    assert slim[0].get("venue") is None and slim[0].get("week", 0) == 1, "Should keep only model fields"
+    assert slim[0]["homeTeam"] is slim[1]["awayTeam"], "Team names should be interned"
+
+    assert hybrid_rating(teams, slim) == hybrid_rating(teams, games), "Hybrid should match"
+    assert run_elo(teams, slim) == run_elo(teams, games), "Elo should match"
+    ratings = hybrid_rating(teams, games)
+    assert records(teams, slim) == records(teams, games), "Records should match"
+    assert strength_of_schedule(teams, slim, ratings) == strength_of_schedule(teams, games, ratings)
+    assert momentum(teams, slim, ratings) == momentum(teams, games, ratings)
+    print("  ✓ Models and analytics accept GameRecords")
+
+def test_live_session_incremental_updates():
+    """Test that live polling against a stub server matches a full recompute"""
+    print("\nTesting live incremental updates...")
+    import asyncio
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    teams = ["Team A", "Team B", "Team C", "Team D"]
+    def game(gid, week, home, away, hp, ap, completed=True):
+        return {"id": gid, "season": 2024, "week": week, "completed": completed, "homeTeam": home,
+                "awayTeam": away, "homePoints": hp if completed else None, "awayPoints": ap if completed else None}
+    cached = [game(1, 1, "Team A", "Team B", 28, 21), game(2, 1, "Team C", "Team D", 10, 13),
+              game(3, 2, "Team A", "Team C", 0, 0, completed=False), game(4, 2, "Team B", "Team D", 0, 0, completed=False)]
+    feed = [game(1, 1, "Team A", "Team B", 28, 21), game(2, 1, "Team C", "Team D", 10, 13),
+            game(3, 2, "Team A", "Team C", 31, 30), game(4, 2, "Team B", "Team D", 0, 0, completed=False)]
+
+    class Stub(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+        def do_GET(self):
+            body = json.dumps(feed).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        published = []
+        session = LiveSession(2024, method="hybrid", base_url=f"http://127.0.0.1:{server.server_address[1]}",
+                              api_key="", subscribers=[published.append], persist=False,
+                              team_list=teams, games=project_games(cached))
+        update = asyncio.run(session.step())
+        assert update["new_games"] == [3], "Only the newly completed game should be fed in"
+        assert asyncio.run(session.step()) is None, "No update when nothing new finished"
+        assert len(published) == 1, "Subscribers should get one update"
+        for method in ("colley", "massey", "elo", "hybrid"):
+            full = compute_ratings(method, teams, feed)
+            live = session.model.ratings(method)
+            assert np.allclose([live[t] for t in teams], [full[t] for t in teams]), f"{method} should match"
+        print("  ✓ Incremental ratings match a full recompute")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_rank_history_queries():
+    """Test movers, trajectory and game-time rank lookups"""
+    print("\nTesting rank history queries...")
+
+    ratings = np.array([[3.0, 2.0, 1.0, np.nan],
+                        [1.0, 2.0, 3.0, 0.5]])
+    ranks = np.array([[1, 2, 3, UNRANKED],
+                      [3, 2, 1, 4]])
+    h = RankHistory(year=2024, method="hybrid", teams=["Team A", "Team B", "Team C", "Team D"],
+                    weeks=np.array([1, 2]), ratings=ratings, ranks=ranks, mtimes=np.zeros(2))
+
+    moves = h.movers(n=5)
+    assert moves["risers"] == [("Team C", 3, 1, 2)], "Team C should rise two places"
+    assert moves["fallers"] == [("Team A", 1, 3, -2)], "Team A should fall two places"
+    assert list(h.trajectory("Team C")[1]) == [3, 1], "Trajectory should follow weekly ranks"
+    assert h.weeks_in_top(1) == {"Team A": 1, "Team B": 0, "Team C": 1, "Team D": 0}
+    assert list(h.rank_at([0, 3, 2], [1, 1, 7])) == [1, UNRANKED, UNRANKED], "Missing weeks are unranked"
+    print("  ✓ Rank history answers movers and lookups")
+
+def test_recency_weighted_sweep():
+    """Test that batched re-weighting matches the weighted builders"""
+    print("\nTesting recency- and margin-weighted models...")
+
+    teams = ["Team A", "Team B", "Team C", "Team D"]
+    games = [
+        {"completed": True, "homeTeam": "Team A", "awayTeam": "Team B", "homePoints": 42, "awayPoints": 7, "week": 1},
+        {"completed": True, "homeTeam": "Team C", "awayTeam": "Team D", "homePoints": 17, "awayPoints": 20, "week": 2},
+        {"completed": True, "homeTeam": "Team B", "awayTeam": "Team C", "homePoints": 24, "awayPoints": 24, "week": 3},
+        {"completed": True, "homeTeam": "Team D", "awayTeam": "Team A", "homePoints": 31, "awayPoints": 28, "week": 4},
+    ]
+    C, b = build_colley(teams, games, recency_decay=0.0)
+    C0, b0 = build_colley(teams, games)
+    assert np.array_equal(C, C0) and np.array_equal(b, b0), "Zero decay should leave Colley unchanged"
+
+    sched = compile_schedule(teams, games)
+    decays = [0.0, 0.1, 0.5]
+    for scale in (None, 10.0):
+        sweep_c = sweep_recency(sched, decays, "colley", margin_scale=scale)
+        sweep_m = sweep_recency(sched, decays, "massey", margin_scale=scale)
+        for k, d in enumerate(decays):
+            C, b = build_colley(teams, games, recency_decay=d, margin_scale=scale)
+            M, mb = build_massey(teams, games, recency_decay=d, margin_scale=scale)
+            assert np.allclose(sweep_c[k], solve_colley(C, b)), f"Colley mismatch at decay {d}"
+            assert np.allclose(sweep_m[k], solve_massey(M, mb)), f"Massey mismatch at decay {d}"
+    print("  ✓ Batched sweep matches per-decay builds")
+
+    late = sweep_recency(sched, [2.0], "massey")[0]
+    assert late[3] > late[0], "With heavy decay the latest result (D over A) should dominate"
+    print("  ✓ Heavy decay favors recent results")
+
+def test_results_cache():
+    """Test that cached ratings match fresh ones and the disk tier evicts"""
+    import tempfile
+    print("\nTesting results cache...")
+
+    teams = ["Team A", "Team B", "Team C"]
+    games = [
+        {"completed": True, "homeTeam": "Team A", "awayTeam": "Team B", "homePoints": 28, "awayPoints": 14, "week": 1},
+        {"completed": True, "homeTeam": "Team B", "awayTeam": "Team C", "homePoints": 21, "awayPoints": 17, "week": 2},
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultsCache(disk_dir=tmp, max_entries=1)
+        first = cached_ratings("massey", teams, games, cache=cache, hfa=2.1)
+        assert first == compute_ratings("massey", teams, games, hfa=2.1), "Cached ratings should match compute_ratings"
+        assert cached_ratings("massey", teams, games, cache=ResultsCache(disk_dir=tmp), hfa=2.1) == first
+        assert cached_ratings("massey", teams, games, cache=cache, hfa=0.0) != first, "Parameters are part of the key"
+        assert games_fingerprint(project_games(games)) == games_fingerprint(games), "Projected games hash the same"
+        print("  ✓ Cached ratings served from memory and disk")
+
+        derived = cached_analytics(teams, games, first, {}, 2099, cache=cache)
+        for part in ("sos", "momentum", "ppoints"):
+            derived[part]["Team A"] = None
+        again = cached_analytics(teams, games, first, {}, 2099, cache=cache)
+        assert all(again[part]["Team A"] is not None for part in ("sos", "momentum", "ppoints")), \
+            "Callers get copies, not the cached entry"
+        print("  ✓ Cached analytics returned as copies")
+
+        small = ResultsCache(disk_dir=tmp, max_bytes=1000)
+        for k in range(5):
+            small.put(f"entry{k}", list(range(100)))
+        assert len(os.listdir(tmp)) < 5, "Disk tier should evict past its size cap"
+        assert small.get_or_compute("entry4", lambda: None) == list(range(100)), "Newest entry survives eviction"
+        print("  ✓ Disk tier respects its size cap")
+
+def test_disconnected_schedule():
+    """Test that each connected component gets its own well-defined solve"""
+    print("\nTesting disconnected schedules...")
+
+    teams = ["Team A", "Team B", "Team C", "Team D", "Team E"]
+    games = [
+        {"completed": True, "homeTeam": "Team A", "awayTeam": "Team B", "homePoints": 28, "awayPoints": 21, "week": 1},
+        {"completed": True, "homeTeam": "Team D", "awayTeam": "Team C", "homePoints": 10, "awayPoints": 35, "week": 1},
+    ]
+    M, mb = build_massey(teams, games, ridge_lambda=0.0)
+    k, labels = connected_components(M, anchored=True)
+    assert k == 3 and labels[0] == labels[1] and labels[2] == labels[3], "A-B, C-D and E are separate components"
+
+    r = solve_massey(M, mb)
+    assert np.isclose(r[0] + r[1], 0) and np.isclose(r[2] + r[3], 0), "Each component is anchored to sum to zero"
+    assert np.isclose(r[0] - r[1], 7 - 2.1) and np.isclose(r[2] - r[3], 25 + 2.1), "Ratings follow margins"
+    assert r[4] == 0.0, "A team without games is rated 0"
+    print(f"  ✓ Massey (no ridge) solved per component: {r}")
+
+    C, b = build_colley(teams, games)
+    r = solve_colley(C, b)
+    C2, b2 = build_colley(teams[:2], games[:1])
+    assert np.allclose(r[:2], solve_colley(C2, b2)), "A component solves as if on its own"
+    assert np.isclose(r[4], 0.5), "A team without games keeps the Colley default"
+    print(f"  ✓ Colley solved per component: {r}")
+
+    sweep = sweep_recency(compile_schedule(teams, games), [0.0, 0.3], "massey", ridge_lambda=0.0)
+    assert np.allclose(sweep[0], solve_massey(M, mb)), "Batched solves use the same components"
+    print("  ✓ Batched sweep matches")
+
+def test_game_graph_resume():
+    """Test quality wins, bad losses, common opponents and win chains"""
+    print("\nTesting game-graph résumé queries...")
+
+    teams = ["Team A", "Team B", "Team C", "Team D"]
+    games = [
+        {"completed": True, "homeTeam": "Team A", "awayTeam": "Team B", "homePoints": 24, "awayPoints": 10, "week": 1},
+        {"completed": True, "homeTeam": "Team B", "awayTeam": "Team C", "homePoints": 31, "awayPoints": 30, "week": 2},
+        {"completed": True, "homeTeam": "Team D", "awayTeam": "Team C", "homePoints": 3, "awayPoints": 20, "week": 2},
+        {"completed": True, "homeTeam": "Team C", "awayTeam": "Team A", "homePoints": 14, "awayPoints": 21, "week": 3},
+    ]
+    ratings = {"Team A": 3.0, "Team B": 2.0, "Team C": 1.0, "Team D": 0.0}
+    history = RankHistory(year=2024, method="hybrid", teams=["Team C", "Team B", "Team A", "Team D"],
+                          weeks=np.array([1, 2]), ratings=np.zeros((2, 4)),
+                          ranks=np.array([[3, 1, 2, 4], [1, 2, 3, 4]]), mtimes=np.zeros(2))
+    g = build_game_graph(teams, games, ratings, history=history)
+
+    # A beat B (rank 1 in week 1) and C (week 3: no snapshot, current rank 3)
+    assert list(g.quality_wins(1)) == [1, 1, 0, 0], "B beat C while C was ranked 1"
+    assert list(g.bad_losses(1)) == [0, 1, 1, 0], "D's loss came to C while C was ranked 1"
+    assert [x["opponent"] for x in g.games_of("Team A")] == ["Team B", "Team C"], "Games are in week order"
+    print("  ✓ Quality wins and bad losses use game-time ranks")
+
+    diff, counts = g.common_opponent_margins()
+    a, d = g.team_index["Team A"], g.team_index["Team D"]
+    assert counts[a, d] == 1 and diff[a, d] == 7 - (-17), "A and D share only C as an opponent"
+    assert g.common_opponents("Team A", "Team D") == [("Team C", 7.0, -17.0)]
+    print("  ✓ Common-opponent margins")
+
+    assert g.win_chain("Team A", "Team D") == ["Team A", "Team C", "Team D"], "A > C > D is the shortest chain"
+    assert g.win_chain("Team D", "Team A") is None, "D beat nobody"
+    assert g.chain_lengths(3)[a, d] == 2 and g.chain_lengths(1)[a, d] == 0
+    print("  ✓ Transitive win chains")
+
+    # A bowl game (CFBD postseason week 1) comes last and is ranked from the latest snapshot, not week 1
+    bowl = {"completed": True, "seasonType": "postseason", "homeTeam": "Team D", "awayTeam": "Team B",
+            "homePoints": 27, "awayPoints": 20, "week": 1}
+    g = build_game_graph(teams, games + [bowl], ratings, history=history)
+    log = g.games_of("Team D")
+    assert [(x["week"], x["postseason"], x["opponent"]) for x in log] == [(2, False, "Team C"), (4, True, "Team B")]
+    assert log[1]["opp_rank"] == 2, "B was ranked 2 in the latest snapshot (1 in week 1)"
+    assert g.quality_wins(1)[g.team_index["Team D"]] == 0 and g.quality_wins(2)[g.team_index["Team D"]] == 1
+    print("  ✓ Postseason games ordered last and ranked from the latest snapshot")
+
+def test_recency_postseason_order():
+    """Test that postseason games count as the most recent, not week 1"""
+    print("\nTesting recency weighting with postseason games...")
+
+    teams = ["Team A", "Team B", "Team C"]
+    games = [{"completed": True, "seasonType": "regular", "homeTeam": "Team A", "awayTeam": "Team B",
+              "homePoints": 30, "awayPoints": 10, "week": w} for w in range(1, 14)]
+    games.append({"completed": True, "seasonType": "postseason", "homeTeam": "Team C", "awayTeam": "Team A",
+                  "homePoints": 24, "awayPoints": 21, "week": 1})
+
+    assert last_scored_week(teams, games) == 14, "The bowl game follows regular-season week 13"
+    sched = compile_schedule(teams, games)
+    w = game_weights(sched, 0.2)[0]
+    assert w[-1] == 1.0 and np.isclose(w[0], np.exp(-0.2 * 13)), "Bowl weighs 1, week 1 is oldest"
+
+    for method, build, solve in (("colley", build_colley, solve_colley), ("massey", build_massey, solve_massey)):
+        A, b = build(teams, games, recency_decay=0.2)
+        assert np.allclose(sweep_recency(sched, [0.2], method)[0], solve(A, b)), f"{method} paths agree"
+    C, b = build_colley(teams, games, recency_decay=0.2)
+    assert np.isclose(C[2, 2] - 2.0, 1.0), "Team C's only game (the bowl) carries full weight"
+    print("  ✓ Postseason games are weighted as the latest games")
+
+def test_render_charts_cache():
+    """Test headless chart rendering, the content-hash skip and empty jobs"""
+    import tempfile
+    print("\nTesting chart rendering...")
+
+    ratings = {"Team A": 1.5, "Team B": 0.5, "Team C": -0.25}
+    recs = {"Team A": (3, 0), "Team B": (2, 1), "Team C": (0, 3)}
+    jobs = [{"name": "top", "ratings": ratings, "records": recs, "n": 3, "title": "Top"},
+            {"name": "conf", "ratings": dict(ratings), "records": recs, "n": 2, "title": "Conference"}]
+    with tempfile.TemporaryDirectory() as tmp:
+        out = render_charts(jobs, tmp, formats=("png", "svg"), workers=2)
+        expected = {os.path.join(tmp, f"{j}.{fmt}") for j in ("top", "conf") for fmt in ("png", "svg")}
+        assert set(out["rendered"]) == expected and not out["skipped"], "Both charts render in both formats"
+        assert all(os.path.getsize(p) > 0 for p in expected), "Chart files are written"
+        print("  ✓ Two jobs rendered as PNG and SVG")
+
+        again = render_charts(jobs, tmp, formats=("png", "svg"), workers=2)
+        assert not again["rendered"] and set(again["skipped"]) == expected, "Unchanged charts are skipped"
+        print("  ✓ Unchanged charts skipped")
+
+        jobs[1]["ratings"] = {**ratings, "Team C": 2.0}
+        changed = render_charts(jobs, tmp, formats=("png", "svg"), workers=2)
+        assert set(changed["rendered"]) == {os.path.join(tmp, f"conf.{fmt}") for fmt in ("png", "svg")}
+        assert set(changed["skipped"]) == {os.path.join(tmp, f"top.{fmt}") for fmt in ("png", "svg")}
+        print("  ✓ Only the changed chart re-rendered")
+
+        empty = render_charts([{"name": "none", "ratings": {}, "records": {}}], tmp)
+        assert empty["empty"] == ["none"] and not empty["rendered"], "Empty jobs are left out"
+        print("  ✓ Empty job skipped")
+
+def test_profiling_recorder():
+    """Test stage/timed/count/gauge recording, per-run scoping and the disabled no-op path"""
+    import json
+    import tempfile
+    import threading
+    print("\nTesting profiling recorder...")
+
+    @profiling.timed("work")
+    def work(x):
+        return x * 2
+
+    # Nothing active: every hook is a no-op
+    assert not profiling.is_enabled() and profiling.current() is None
+    with profiling.stage("ignored"):
+        pass
+    assert work(2) == 4
+    profiling.count("ignored"); profiling.gauge("ignored", 5)
+    assert profiling.report() == {"enabled": False, "wall": 0.0, "stages": {}, "counters": {}, "gauges": {}}
+    with profiling.recording(False) as rec:
+        assert rec is None and not profiling.is_enabled()
+        profiling.count("ignored")
+        assert not profiling.report()["counters"]
+    print("  ✓ Disabled hooks record nothing")
+
+    with profiling.recording() as rec:
+        with profiling.stage("fetch"):
+            pass
+        with profiling.stage("fetch"):
+            pass
+        assert work(3) == 6
+        profiling.count("games", 10); profiling.count("games", 5); profiling.count("hits")
+        profiling.gauge("matrix_n", 130); profiling.gauge("matrix_n", 90)
+        rep = profiling.report()
+        assert rep["enabled"] and rep["wall"] >= 0
+        assert rep["stages"]["fetch"]["calls"] == 2 and rep["stages"]["work"]["calls"] == 1
+        fetch = rep["stages"]["fetch"]
+        assert abs(fetch["mean"] - fetch["total"] / 2) < 1e-12 and fetch["max"] <= fetch["total"]
+        assert rep["counters"] == {"games": 15, "hits": 1}
+        assert rep["gauges"] == {"matrix_n": 130}, "Gauges keep the largest value"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            written = profiling.write_report(path)
+            with open(path, "r", encoding="utf-8") as f:
+                assert json.load(f)["counters"] == written["counters"] == rep["counters"]
+        assert "fetch" in profiling.format_report(rep)
+    assert profiling.current() is None, "Recording ends with the block"
+    print("  ✓ Stages, timed functions, counters and gauges recorded and written")
+
+    # Concurrent runs (e.g. two dashboard sessions) each see only their own measurements
+    seen = {}
+    barrier = threading.Barrier(2)
+
+    def session(name, n):
+        profiling.start()
+        barrier.wait()
+        profiling.count("games", n)
+        barrier.wait()
+        seen[name] = profiling.report()["counters"]
+
+    threads = [threading.Thread(target=session, args=(name, n)) for name, n in (("a", 1), ("b", 2))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert seen == {"a": {"games": 1}, "b": {"games": 2}}, seen
+    print("  ✓ Concurrent runs keep separate recorders")
+
+def test_run_seasons_index():
+    """Test the multi-season pipeline: per-season files, the merged index and failed seasons"""
+    import dataclasses
+    import glob
+    import json
+    import tempfile
+    from cfbratings import io, seasons
+    from cfbratings.analytics import ppoints_fast
+    print("\nTesting multi-season pipeline...")
+
+    teams = [{"school": t, "conference": c} for t, c in
+             (("Team A", "East"), ("Team B", "East"), ("Team C", "West"), ("Team D", "West"))]
+    # East wins narrowly in week 1, West wins big in week 2: the week-1 snapshot differs from the final ratings
+    results = [(1, "Team A", "Team C", 20, 17), (1, "Team B", "Team D", 20, 17),
+               (2, "Team C", "Team A", 38, 10), (2, "Team D", "Team B", 35, 14)]
+    conf = {t["school"]: t["conference"] for t in teams}
+    modules = (io, seasons)
+    saved = [m.settings for m in modules]
+    with tempfile.TemporaryDirectory() as tmp:
+        for m in modules:
+            m.settings = dataclasses.replace(m.settings, cache_dir=tmp, api_key="")
+        try:
+            for year in (2021, 2022):
+                games = [{"id": k, "season": year, "week": w, "seasonType": "regular", "completed": True,
+                          "homeTeam": h, "awayTeam": a, "homePoints": hp, "awayPoints": ap,
+                          "homeConference": conf[h], "awayConference": conf[a]}
+                         for k, (w, h, a, hp, ap) in enumerate(results)]
+                with open(os.path.join(tmp, f"teams_{year}.json"), "w", encoding="utf-8") as f:
+                    json.dump(teams, f)
+                with open(os.path.join(tmp, f"games_{year}_both.json"), "w", encoding="utf-8") as f:
+                    json.dump(games, f)
+
+            index = seasons.run_seasons([2021, 2022, 2023], method="massey", workers=2)
+            out_dir = os.path.join(tmp, "seasons")
+            assert seasons.seasons_dir() == out_dir, "Output defaults to the cache directory"
+            for year in (2021, 2022):
+                with open(seasons.season_output_path(out_dir, year, "massey"), "r", encoding="utf-8") as f:
+                    season = json.load(f)
+                assert season["year"] == year and season["latest_week"] == 2
+                assert set(season["teams"]) == {t["school"] for t in teams}
+                assert season["teams"]["Team A"]["record"] == [1, 1]
+
+                # PPoints is scored from the hybrid weekly snapshots, not current ranks alone
+                assert glob.glob(os.path.join(tmp, f"ratings_{year}_hybrid_week*.json"))
+                assert not glob.glob(os.path.join(tmp, f"ratings_{year}_massey_week*.json"))
+                team_list = [t["school"] for t in teams]
+                games = io.fetch_games_slim(year)
+                ratings = {t: v["rating"] for t, v in season["teams"].items()}
+                with_snapshots = ppoints_fast(team_list, games, ratings, conf, method="hybrid", year=year)
+                without = ppoints_fast(team_list, games, ratings, conf, method="none", year=year)
+                written_pp = {t: v["ppoints"] for t, v in season["teams"].items()}
+                assert all(np.isclose(written_pp[t], with_snapshots[t]) for t in team_list)
+                assert any(not np.isclose(written_pp[t], without[t]) for t in team_list)
+            print("  ✓ Per-season files written, PPoints from the weekly snapshots")
+
+            with open(os.path.join(out_dir, "index_massey.json"), "r", encoding="utf-8") as f:
+                written = json.load(f)
+            assert [s["year"] for s in written["seasons"]] == [2021, 2022]
+            assert written["seasons"][0]["games"] == 4 and written["seasons"][0]["teams"] == 4
+            assert list(written["errors"]) == ["2023"] and "CFBD_API_KEY" in written["errors"]["2023"]
+            assert written["errors"] == index["errors"]
+            print("  ✓ Merged index lists both seasons and records the missing one")
+        finally:
+            for m, s in zip(modules, saved):
+                m.settings = s
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Running Robustness Tests")
@@ -169,6 +660,19 @@ if __name__ == "__main__":
         test_identical_ratings()
         test_singular_matrix_handling()
         test_max_week_empty_games()
+        test_conference_strength_arrays()
+        test_ppoints_fast_matches_reference()
+        test_projected_games_match_raw()
+        test_live_session_incremental_updates()
+        test_rank_history_queries()
+        test_recency_weighted_sweep()
+        test_results_cache()
+        test_disconnected_schedule()
+        test_game_graph_resume()
+        test_recency_postseason_order()
+        test_render_charts_cache()
+        test_profiling_recorder()
+        test_run_seasons_index()
 
         print("\n" + "=" * 60)
         print("✓ All robustness tests passed!")